@@ -0,0 +1,219 @@
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from binary_calculator import BinaryWordCalculator
+
+
+# Слова для синтетических текстов
+RUSSIAN_WORDS = ["привет", "мир", "охота", "война", "слово", "калькулятор", "двоичный",
+                 "код", "звезда", "ёлка", "щука", "объём", "съезд", "юность", "язык"]
+LATIN_WORDS = ["hello", "world", "binary", "calculator", "word", "code", "star",
+               "bits", "byte", "stream", "pattern", "value", "quick", "fox", "jump"]
+ALPHABETS = {
+    "russian": RUSSIAN_WORDS,
+    "latin": LATIN_WORDS,
+    "mixed": RUSSIAN_WORDS + LATIN_WORDS,
+}
+
+# Размеры входа по умолчанию (в байтах UTF-8)
+DEFAULT_SIZES = "10,1K,100K,1M"
+UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text):
+    """Разбирает размер вида 10, 100K, 1M"""
+    text = text.strip().upper()
+    if text and text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(size):
+    """Печатает размер в удобных единицах"""
+    for unit in ("G", "M", "K"):
+        if size >= UNITS[unit] and size % UNITS[unit] == 0:
+            return f"{size // UNITS[unit]}{unit}"
+    return str(size)
+
+
+def make_text(size, alphabet="mixed", seed=0):
+    """Строит текст из случайных слов длиной ровно size байт в UTF-8"""
+    words = ALPHABETS[alphabet]
+    rng = random.Random(seed)
+
+    # Сначала набираем блок около 64 КБ, затем повторяем его
+    parts, total = [], 0
+    while total < min(size, 1 << 16):
+        word = rng.choice(words) + " "
+        parts.append(word)
+        total += len(word.encode("utf-8"))
+    block = "".join(parts).encode("utf-8")
+
+    data = (block * (size // len(block) + 1))[:size]
+    # Не обрываем многобайтовый символ на конце
+    return data.decode("utf-8", errors="ignore")
+
+
+def make_cases(calculator, size, alphabet):
+    """Готовит входные данные и функции для всех измеряемых путей"""
+    text = make_text(size, alphabet)
+    other = make_text(size, alphabet, seed=1)
+    bits = calculator.word_to_binary(text, "utf-8")
+    other_bits = calculator.word_to_binary(other, "utf-8")
+    nbytes = len(bits) // 8
+
+    return {
+        "word_to_binary": (nbytes, lambda: calculator.word_to_binary(text, "utf-8")),
+        "binary_to_word": (nbytes, lambda: calculator.binary_to_word(bits, "utf-8")),
+        "binary_operations": (nbytes, lambda: calculator.binary_operations(bits, other_bits, "xor")),
+        "analyze_binary_pattern": (nbytes, lambda: calculator.analyze_binary_pattern(bits)),
+        "calculate_binary_value": (nbytes, lambda: calculator.calculate_binary_value(bits)),
+    }
+
+
+def measure(function, repeat, min_time=0.2):
+    """Лучшее время одного вызова: повторяет вызов, пока не наберётся min_time"""
+    best = float("inf")
+    for _ in range(repeat):
+        calls, started = 0, time.perf_counter()
+        while True:
+            function()
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def measure_memory(function):
+    """Пиковая память одного вызова по tracemalloc (в байтах)"""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(sizes, paths=None, alphabet="mixed", repeat=3, memory=True):
+    """Прогоняет все пути на всех размерах; возвращает список результатов"""
+    calculator = BinaryWordCalculator()
+    results = []
+
+    for size in sizes:
+        cases = make_cases(calculator, size, alphabet)
+        for path, (nbytes, function) in cases.items():
+            if paths and path not in paths:
+                continue
+
+            seconds = measure(function, repeat)
+            result = {
+                "путь": path,
+                "размер": size,
+                "секунд": seconds,
+                "операций_в_секунду": 1 / seconds if seconds else float("inf"),
+                "мб_в_секунду": nbytes / seconds / 1e6 if seconds else float("inf"),
+                "пик_памяти": measure_memory(function) if memory else None,
+            }
+            results.append(result)
+            print_result(result)
+
+    return results
+
+
+def print_result(result):
+    """Печатает строку таблицы результатов"""
+    memory = result["пик_памяти"]
+    memory = f"{memory / (1 << 20):10.2f} МБ" if memory is not None else f"{'-':>13}"
+    print(f"{result['путь']:<24} {format_size(result['размер']):>6} "
+          f"{result['мб_в_секунду']:12.2f} МБ/с {result['операций_в_секунду']:14.1f} оп/с {memory}",
+          flush=True)
+
+
+def save_baseline(path, results, alphabet):
+    """Сохраняет результаты как базовую линию"""
+    data = {
+        "создано": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "алфавит": alphabet,
+        "результаты": results,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+
+
+def compare_with_baseline(path, results, threshold):
+    """Сравнивает с базовой линией; возвращает список регрессий
+
+    Регрессия - падение пропускной способности или рост пиковой памяти
+    больше чем на threshold (доля, 0.2 = 20%).
+    """
+    with open(path, encoding="utf-8") as file:
+        baseline = {(item["путь"], item["размер"]): item for item in json.load(file)["результаты"]}
+
+    regressions = []
+    for result in results:
+        old = baseline.get((result["путь"], result["размер"]))
+        if old is None:
+            continue
+
+        label = f"{result['путь']} [{format_size(result['размер'])}]"
+        speed = result["мб_в_секунду"] / old["мб_в_секунду"] if old["мб_в_секунду"] else 1.0
+        if speed < 1 - threshold:
+            regressions.append(f"{label}: скорость {speed:.0%} от базовой")
+
+        if result["пик_памяти"] and old.get("пик_памяти"):
+            growth = result["пик_памяти"] / old["пик_памяти"]
+            if growth > 1 + threshold:
+                regressions.append(f"{label}: пик памяти {growth:.0%} от базового")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замеры скорости BinaryWordCalculator")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="размеры входа через запятую, например 10,1K,1M,100M")
+    parser.add_argument("--paths", default="",
+                        help="только эти пути через запятую (по умолчанию все)")
+    parser.add_argument("--alphabet", choices=sorted(ALPHABETS), default="mixed",
+                        help="слова для синтетического текста")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов замера")
+    parser.add_argument("--no-memory", action="store_true", help="не замерять пиковую память")
+    parser.add_argument("--save", metavar="FILE", help="сохранить результаты как базовую линию")
+    parser.add_argument("--compare", metavar="FILE", help="сравнить с базовой линией")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="допустимое ухудшение при сравнении (доля, по умолчанию 0.2)")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size.strip()]
+    paths = [path.strip() for path in args.paths.split(",") if path.strip()]
+
+    print(f"{'Путь':<24} {'Размер':>6} {'Скорость':>17} {'Операций':>19} {'Пик памяти':>13}")
+    print("-" * 86)
+    results = run_benchmarks(sizes, paths, args.alphabet, args.repeat, not args.no_memory)
+
+    if args.save:
+        save_baseline(args.save, results, args.alphabet)
+        print(f"\nБазовая линия сохранена в {args.save}")
+
+    if args.compare:
+        regressions = compare_with_baseline(args.compare, results, args.threshold)
+        if regressions:
+            print(f"\nРЕГРЕССИИ (порог {args.threshold:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nРегрессий нет (порог {args.threshold:.0%})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
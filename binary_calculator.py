@@ -1,153 +1,1435 @@
-class BinaryWordCalculator:
+import argparse
+import codecs
+import csv
+import fileinput
+import json
+import os
+import re
+import sys
+import threading
+from array import array
+from collections import Counter, OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from html import escape as html_escape
+from functools import lru_cache
+from itertools import chain, combinations, compress, filterfalse, islice, repeat
+from types import MappingProxyType
+
+
+class BitString:
+    """Компактная битовая строка: байты + длина в битах.
+
+    Биты хранятся упакованными (старший бит первым), поэтому строка
+    занимает столько же памяти, сколько исходные байты. В текст из 0 и 1
+    значение превращается только при выводе (str, print, f-строки).
+
+    Битовые строки сравниваются и хешируются по упакованным байтам и
+    длине; с текстом из 0 и 1 строка не равна - его сначала разбирают
+    через BitString.coerce. Упакованные байты без копирования дают
+    bytes(bits); memoryview(bits) работает только на Python 3.12+
+    (__buffer__), на старых версиях - memoryview(bytes(bits)).
+    """
+    __slots__ = ('_data', '_length', '_hash')
+
+    def __init__(self, data=b'', length=None):
+        data = bytes(data)
+        if length is None:
+            length = len(data) * 8
+        if length < 0 or length > len(data) * 8:
+            raise ValueError(f"Длина {length} бит не помещается в {len(data)} байт")
+
+        # Отбрасываем лишние байты и обнуляем хвостовые биты
+        nbytes = (length + 7) // 8
+        if len(data) != nbytes:
+            data = data[:nbytes]
+        tail = length % 8
+        if tail and data[-1] & (0xFF >> tail):
+            data = data[:-1] + bytes([data[-1] & (0xFF << (8 - tail)) & 0xFF])
+
+        self._data = data
+        self._length = length
+        self._hash = None
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Создаёт битовую строку из байтов без копирования"""
+        return cls(data)
+
+    @classmethod
+    def from_int(cls, value, length=None):
+        """Создаёт битовую строку из неотрицательного целого заданной ширины"""
+        if value < 0:
+            raise ValueError("Отрицательное число нельзя представить битовой строкой")
+        if length is None:
+            length = max(value.bit_length(), 1)
+        value &= (1 << length) - 1
+        nbytes = (length + 7) // 8
+        pad = nbytes * 8 - length
+        return cls((value << pad).to_bytes(nbytes, 'big'), length)
+
+    @classmethod
+    def from_text(cls, text):
+        """Разбирает текст из 0 и 1 (пробелы между битами допускаются)"""
+        text = ''.join(text.split())
+        if not text:
+            return cls()
+        if text.strip('01'):
+            raise ValueError("Двоичный код должен содержать только 0 и 1")
+        return cls.from_int(int(text, 2), len(text))
+
+    @classmethod
+    def coerce(cls, value):
+        """Приводит строку, байты или BitString к BitString"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls.from_text(value)
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(value)
+        raise TypeError(f"Невозможно преобразовать {type(value).__name__} в BitString")
+
+    def to_bytes(self):
+        """Возвращает упакованные байты (последний байт дополнен нулями)"""
+        return self._data
+
+    def to_int(self):
+        """Возвращает биты как неотрицательное целое число"""
+        pad = len(self._data) * 8 - self._length
+        return int.from_bytes(self._data, 'big') >> pad
+
+    def count(self, bit):
+        """Считает количество битов '1' или '0'"""
+        ones = self.to_int().bit_count()
+        if bit in ('1', 1):
+            return ones
+        if bit in ('0', 0):
+            return self._length - ones
+        raise ValueError("Можно считать только биты '0' и '1'")
+
+    def __bytes__(self):
+        return self._data
+
+    def __buffer__(self, flags):
+        # Протокол буфера (Python 3.12+); на старых версиях - memoryview(bytes(bits))
+        return memoryview(self._data)
+
+    def __int__(self):
+        return self.to_int()
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __iter__(self):
+        # Биты выдаются побайтно, без распаковки всей строки в текст
+        full, tail = divmod(self._length, 8)
+        for byte in islice(self._data, full):
+            yield from BYTE_BITS[byte]
+        if tail:
+            yield from BYTE_BITS[self._data[full]][:tail]
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._length)
+            if step != 1:
+                return BitString.from_text(str(self)[key])
+            if stop <= start:
+                return BitString()
+            # Срез по границам байтов - без распаковки
+            if start % 8 == 0 and (stop % 8 == 0 or stop == self._length):
+                return BitString(self._data[start // 8:(stop + 7) // 8], stop - start)
+            value = self.to_int() >> (self._length - stop)
+            return BitString.from_int(value, stop - start)
+
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("Индекс бита вне диапазона")
+        return '1' if self._data[key // 8] & (0x80 >> (key % 8)) else '0'
+
+    def __add__(self, other):
+        other = BitString.coerce(other)
+        if self._length % 8 == 0:
+            return BitString(self._data + other._data, self._length + other._length)
+        value = (self.to_int() << other._length) | other.to_int()
+        return BitString.from_int(value, self._length + other._length)
+
+    def __radd__(self, other):
+        return BitString.coerce(other) + self
+
+    def __eq__(self, other):
+        if not isinstance(other, BitString):
+            return NotImplemented
+        return self._length == other._length and self._data == other._data
+
+    def __hash__(self):
+        # Считается один раз по упакованным байтам (хеш bytes тоже запоминается)
+        if self._hash is None:
+            self._hash = hash((self._length, self._data))
+        return self._hash
+
+    def __str__(self):
+        if not self._length:
+            return ''
+        return format(self.to_int(), f'0{self._length}b')
+
+    def __repr__(self):
+        text = str(self)
+        if len(text) > 64:
+            text = text[:64] + '...'
+        return f"BitString('{text}', {self._length} бит)"
+
+
+# Побитовые операции над целым числом (not - над одним операндом)
+BITWISE_OPERATIONS = ("xor", "and", "or", "nand", "nor", "xnor", "not")
+
+# Операции, где второй операнд - величина сдвига
+SHIFT_OPERATIONS = ("shl", "shr", "sar", "rol", "ror")
+
+# Арифметические операции (выполняются через BinaryNumber)
+ARITHMETIC_OPERATIONS = ("add", "subtract", "multiply", "divide", "mod", "power")
+
+class BinaryNumber:
+    """Целое число фиксированной (или неограниченной) разрядности
+
+    Значение хранится как int, поэтому цепочки операций не переводят его в
+    строку; в двоичный код оно превращается только в to_bits()/str().
+    При заданной ширине width результат заворачивается по модулю 2**width
+    (для signed=True - в дополнительном коде), а флаг overflow
+    запоминает, что хотя бы одна операция в цепочке вышла за диапазон.
+    Без ширины беззнаковое число не может стать отрицательным: результат
+    обнуляется и тоже отмечается переполнением. Деление - с округлением
+    вниз, как в Python.
+    """
+    __slots__ = ('value', 'width', 'signed', 'overflow')
+
+    def __init__(self, value=0, width=None, signed=False, overflow=False):
+        if width is not None and width < 0:
+            raise ValueError(f"Разрядность не может быть отрицательной: {width}")
+        if signed and not width:
+            # Без разрядности знаковый бит не определён
+            raise ValueError("Знаковому числу нужна положительная разрядность")
+        self.width = width
+        self.signed = signed
+        self.value, wrapped = self._wrap(value)
+        self.overflow = overflow or wrapped
+
+    @classmethod
+    def from_bits(cls, bits, width=None, signed=False):
+        """Читает число из двоичного кода (для signed - в дополнительном коде)
+
+        Код короче width дополняется ведущими нулями, как в побитовых
+        операциях, и только потом читается знаковый бит.
+        """
+        bits = BitString.coerce(bits)
+        value = bits.to_int()
+        length = max(len(bits), width or 0)
+        if signed and length and value >> (length - 1):
+            value -= 1 << length
+        # Знаковому числу нужна разрядность - по умолчанию длина кода
+        if signed and width is None:
+            width = len(bits)
+        return cls(value, width, signed)
+
+    def _wrap(self, value):
+        """Приводит значение к диапазону; второй элемент - было ли переполнение"""
+        if self.width is None:
+            if not self.signed and value < 0:
+                return 0, True
+            return value, False
+        
+        if self.signed:
+            low, high = -(1 << (self.width - 1)), (1 << (self.width - 1)) - 1
+        else:
+            low, high = 0, (1 << self.width) - 1
+        if low <= value <= high:
+            return value, False
+        
+        wrapped = value & ((1 << self.width) - 1)
+        if self.signed and wrapped > high:
+            wrapped -= 1 << self.width
+        return wrapped, True
+
+    def _result(self, value, other=None):
+        """Новое число той же разрядности; переполнение наследуется от операндов"""
+        overflow = self.overflow or (isinstance(other, BinaryNumber) and other.overflow)
+        return BinaryNumber(value, self.width, self.signed, overflow)
+
+    @staticmethod
+    def _value(other):
+        if isinstance(other, BinaryNumber):
+            return other.value
+        if isinstance(other, int):
+            return other
+        return BitString.coerce(other).to_int()
+
+    def __add__(self, other):
+        return self._result(self.value + self._value(other), other)
+
+    def __sub__(self, other):
+        return self._result(self.value - self._value(other), other)
+
+    def __mul__(self, other):
+        return self._result(self.value * self._value(other), other)
+
+    def __floordiv__(self, other):
+        return self._result(self.value // self._value(other), other)
+
+    def __mod__(self, other):
+        return self._result(self.value % self._value(other), other)
+
+    def __divmod__(self, other):
+        quotient, remainder = divmod(self.value, self._value(other))
+        return self._result(quotient, other), self._result(remainder, other)
+
+    def __pow__(self, exponent, modulus=None):
+        exponent = self._value(exponent)
+        if exponent < 0 and modulus is None:
+            # Без модуля результат был бы дробным, а число - целое
+            raise ValueError("Отрицательная степень допустима только по модулю")
+        if modulus is not None:
+            return self._result(pow(self.value, exponent, self._value(modulus)), modulus)
+        if self.width is not None and exponent > 0 and \
+                exponent * (abs(self.value).bit_length() - 1) > self.width:
+            # Результат заведомо шире width - считаем сразу по модулю 2**width
+            result = self._result(pow(self.value, exponent, 1 << self.width))
+            result.overflow = True
+            return result
+        return self._result(self.value ** exponent)
+
+    def __neg__(self):
+        return self._result(-self.value)
+
+    def compare(self, other):
+        """Сравнение: -1, 0 или 1"""
+        other = self._value(other)
+        return (self.value > other) - (self.value < other)
+
+    def __eq__(self, other):
+        if not isinstance(other, (BinaryNumber, int)):
+            return NotImplemented
+        return self.value == self._value(other)
+
+    def __lt__(self, other):
+        return self.value < self._value(other)
+
+    def __le__(self, other):
+        return self.value <= self._value(other)
+
+    def __gt__(self, other):
+        return self.value > self._value(other)
+
+    def __ge__(self, other):
+        return self.value >= self._value(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __int__(self):
+        return self.value
+
+    def to_bits(self):
+        """Двоичный код числа (для ширины width - ровно width бит)"""
+        if self.width is None:
+            return BitString.from_int(abs(self.value))
+        return BitString.from_int(self.value & ((1 << self.width) - 1), self.width)
+
+    def __str__(self):
+        return str(self.to_bits())
+
+    def __repr__(self):
+        kind = f"{'int' if self.signed else 'uint'}{self.width or ''}"
+        flag = ", переполнение" if self.overflow else ""
+        return f"BinaryNumber({self.value}, {kind}{flag})"
+
+
+# Таблица байт -> 8 символов '0'/'1' для быстрого вывода коротких слов
+BYTE_BITS = tuple(format(byte, '08b') for byte in range(256))
+
+# Отображение битов для визуализации: обычный текст, цвета терминала, HTML
+VISUAL_STYLES = {
+    "plain": str.maketrans({'1': '█', '0': '░'}),
+    "ansi": str.maketrans({'1': '\033[32m█\033[0m', '0': '\033[2m░\033[0m'}),
+    "html": str.maketrans({'1': '<span class="bit-1">█</span>', '0': '<span class="bit-0">░</span>'}),
+}
+
+# Результат пакетного кодирования одного слова
+BatchItem = namedtuple('BatchItem', 'index word bits error')
+
+# Описание ошибки кодирования: позиция слова и символов, причина
+EncodingFailure = namedtuple('EncodingFailure', 'index word start end reason')
+
+# Политики ошибок word_to_binary/binary_to_word:
+# print - сообщить в консоль и вернуть пустой результат (как в меню),
+# strict - исключение, replace - заменить испорченное, skip - пропустить,
+# collect - заменить и вернуть ConversionResult со списком ошибок
+ERROR_POLICIES = ("print", "strict", "replace", "skip", "collect")
+
+# Ошибка преобразования: отрезок [start, end) и причина. Для word_to_binary
+# позиции - в символах слова, для binary_to_word - в битах двоичного кода
+ConversionError = namedtuple('ConversionError', 'start end reason')
+
+# Результат при политике collect: значение и список ConversionError
+ConversionResult = namedtuple('ConversionResult', 'value errors')
+
+# Ошибки, собранные обработчиком кодека в текущем потоке
+_collected = threading.local()
+
+
+def _collect_codec_error(error):
+    """Обработчик ошибок кодека для политики collect: запоминает место и заменяет"""
+    _collected.errors.append(ConversionError(error.start, error.end, error.reason))
+    if isinstance(error, UnicodeDecodeError):
+        return '\ufffd', error.end
+    return '?' * (error.end - error.start), error.end
+
+
+codecs.register_error('binary_calculator.collect', _collect_codec_error)
+
+
+def codec_collect(convert):
+    """Вызывает convert(errors) с собирающим обработчиком; возвращает (значение, ошибки)"""
+    _collected.errors = []
+    value = convert('binary_calculator.collect')
+    errors, _collected.errors = _collected.errors, []
+    return value, errors
+
+
+def bytes_to_text(data):
+    """Переводит байты в текст из 0 и 1 по таблице BYTE_BITS"""
+    return ''.join([BYTE_BITS[byte] for byte in data])
+
+
+class PackedBatch:
+    """Пакет закодированных слов: общий буфер байтов и смещения каждого слова"""
+    __slots__ = ('buffer', 'offsets', 'errors')
+
     def __init__(self):
-        # Кодировка по умолчанию - UTF-8
-        self.encoding = 'utf-8'
+        self.buffer = bytearray()
+        self.offsets = array('Q', [0])
+        self.errors = []
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _span(self, index):
+        """Границы слова с номером index в буфере (отрицательные - с конца)"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Номер слова вне диапазона")
+        return self.offsets[index], self.offsets[index + 1]
+
+    def __getitem__(self, index):
+        start, end = self._span(index)
+        return BitString(self.buffer[start:end])
+
+    def text(self, index):
+        """Возвращает двоичный код слова с номером index в виде текста"""
+        start, end = self._span(index)
+        return bytes_to_text(memoryview(self.buffer)[start:end])
+
+
+def clean_bit_text(chunk):
+    """Убирает пробелы и переводы строк из куска текста и проверяет биты"""
+    if isinstance(chunk, bytes):
+        chunk = chunk.decode('ascii')
+    
+    bits = ''.join(chunk.split())
+    if bits.strip('01'):
+        raise ValueError("Двоичный код должен содержать только 0 и 1")
+    return bits
+
+
+def read_bit_chunks(source, chunk_size=1 << 16):
+    """Читает текст из 0 и 1 кусками, убирая пробелы и переводы строк"""
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        bits = clean_bit_text(chunk)
+        if bits:
+            yield bits
+
+
+class ByteGroups:
+    """Ленивый список байтов битовой строки (байты нарезаются по запросу)"""
+    __slots__ = ('_bits',)
+
+    def __init__(self, bits):
+        self._bits = bits
+
+    def __len__(self):
+        return (len(self._bits) + 7) // 8
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Индекс байта вне диапазона")
+        return self._bits[index * 8:index * 8 + 8]
+
+
+class BitPatternStats:
+    """Однопроходная статистика битового потока, накапливаемая по кускам
+
+    Считает единицы, гистограммы длин серий 0 и 1, число переходов и
+    автокорреляцию для сдвигов 1..max_lag. Хранит только счётчики, первую
+    и последнюю серии и последние max_lag бит, поэтому память не зависит
+    от длины потока.
+    """
+    # Серии длиннее этого порога досчитываются по тексту регулярным выражением
+    RUN_SCAN_LIMIT = 64
+    LONG_RUNS = {'0': re.compile('0{64,}'), '1': re.compile('1{64,}')}
+
+    def __init__(self, max_lag=8, preview_bits=64):
+        self.max_lag = max_lag
+        # Начало потока нужно и для склейки автокорреляции при слиянии
+        self.preview_bits = max(preview_bits, max_lag)
+        self.length = 0
+        self.ones = 0
+        # Завершённые серии (кроме первой): бит -> {длина: количество}
+        self.runs = {'0': Counter(), '1': Counter()}
+        # Первая завершённая серия и текущая незавершённая: (бит, длина)
+        self.head = None
+        self.tail = None
+        # Для каждого сдвига: число пар и число несовпадающих пар
+        self.pairs = [0] * (max_lag + 1)
+        self.mismatches = [0] * (max_lag + 1)
+        self.tail_bits = ''
+        self.preview = ''
+
+    def update(self, bits):
+        """Добавляет очередной кусок (BitString, байты или текст из 0 и 1)"""
+        self.update_text(str(BitString.coerce(bits)))
+
+    def update_text(self, text):
+        """Добавляет очередной кусок в виде проверенного текста из 0 и 1"""
+        n = len(text)
+        if not n:
+            return
+        
+        # Пары битов на расстоянии k, у которых второй бит - в новом куске
+        window = self.tail_bits + text
+        value = int(window, 2)
+        for lag in range(1, self.max_lag + 1):
+            count = min(n, len(window) - lag)
+            if count > 0:
+                self.pairs[lag] += count
+                self.mismatches[lag] += ((value ^ (value >> lag)) & ((1 << count) - 1)).bit_count()
+        
+        chunk = value & ((1 << n) - 1)
+        self.ones += chunk.bit_count()
+        self._update_runs(text, chunk)
+        
+        self.length += n
+        self.tail_bits = window[-self.max_lag:] if self.max_lag else ''
+        if len(self.preview) < self.preview_bits:
+            self.preview += text[:self.preview_bits - len(self.preview)]
+
+    def _update_runs(self, text, value):
+        """Обновляет серии: первая серия куска продолжает последнюю серию потока"""
+        n = len(text)
+        first = text[0]
+        lead = n - len(text.lstrip(first))
+        
+        carried = 0
+        if self.tail and self.tail[0] == first:
+            carried = self.tail[1]
+        elif self.tail:
+            self._close_run(self.tail)
+        
+        if lead == n:
+            # Весь кусок - одна серия, она остаётся открытой
+            self.tail = (first, carried + n)
+            return
+        self._close_run((first, carried + lead))
+        
+        last = text[-1]
+        trail = n - len(text.rstrip(last))
+        self._count_runs(value, text, '1')
+        self._count_runs(value ^ ((1 << n) - 1), text, '0')
+        
+        # Крайние серии куска уже учтены отдельно
+        self.runs[first][lead] -= 1
+        self.runs[last][trail] -= 1
+        self.tail = (last, trail)
+
+    def _count_runs(self, value, text, bit):
+        """Добавляет в гистограмму серии единичных битов маски value
+
+        После k-го шага value &= value >> 1 в маске остаются только серии
+        длиной больше k, поэтому число концов серий на каждом шаге даёт
+        число серий не короче k + 1 - без перебора отдельных серий.
+        """
+        counter = self.runs[bit]
+        previous = (value & ~(value >> 1)).bit_count()
+        length = 1
+        while previous and length < self.RUN_SCAN_LIMIT:
+            value &= value >> 1
+            current = (value & ~(value >> 1)).bit_count()
+            if previous != current:
+                counter[length] += previous - current
+            previous = current
+            length += 1
+        if previous:
+            counter.update(map(len, self.LONG_RUNS[bit].findall(text)))
+
+    def _close_run(self, run):
+        if self.head is None:
+            self.head = run
+        else:
+            self.runs[run[0]][run[1]] += 1
+
+    def merge(self, other):
+        """Дописывает статистику следующего за этим куска потока (other)
+
+        Серии на границе склеиваются, пары битов через границу
+        досчитываются по хвосту этого куска и началу следующего, поэтому
+        результат совпадает с последовательным анализом всего потока.
+        """
+        if not other.length:
+            return self
+        if not self.length:
+            vars(self).update(deepcopy(vars(other)))
+            return self
+        
+        # Пары (i, i + lag), где i - в этом куске, а i + lag - в следующем
+        head_bits = other.preview[:self.max_lag]
+        for lag in range(1, self.max_lag + 1):
+            for j in range(min(lag, len(head_bits))):
+                i = len(self.tail_bits) - lag + j
+                if i >= 0:
+                    self.pairs[lag] += 1
+                    self.mismatches[lag] += self.tail_bits[i] != head_bits[j]
+            self.pairs[lag] += other.pairs[lag]
+            self.mismatches[lag] += other.mismatches[lag]
+        
+        # Первая серия следующего куска продолжает последнюю серию этого
+        first = other.head or other.tail
+        if self.tail[0] == first[0]:
+            joined = (first[0], self.tail[1] + first[1])
+        else:
+            self._close_run(self.tail)
+            joined = first
+        if other.head is None:
+            self.tail = joined
+        else:
+            self._close_run(joined)
+            for bit, counter in other.runs.items():
+                self.runs[bit].update(counter)
+            self.tail = other.tail
+        
+        self.length += other.length
+        self.ones += other.ones
+        self.tail_bits = (self.tail_bits + other.tail_bits)[-self.max_lag:] if self.max_lag else ''
+        if len(self.preview) < self.preview_bits:
+            self.preview += other.preview[:self.preview_bits - len(self.preview)]
+        return self
+    
+    def histograms(self):
+        """Полные гистограммы длин серий (включая первую и последнюю)"""
+        runs = {bit: Counter(counter) for bit, counter in self.runs.items()}
+        for run in (self.head, self.tail):
+            if run:
+                runs[run[0]][run[1]] += 1
+        return {bit: dict(sorted((length, count) for length, count in counter.items() if count))
+                for bit, counter in runs.items()}
+
+    def result(self, byte_groups=None):
+        """Возвращает словарь в формате analyze_binary_pattern"""
+        if not self.length:
+            return {}
+        
+        zeros = self.length - self.ones
+        runs = self.histograms()
+        autocorrelation = {
+            lag: round((self.pairs[lag] - 2 * self.mismatches[lag]) / self.pairs[lag], 4)
+            for lag in range(1, self.max_lag + 1) if self.pairs[lag]
+        }
+        
+        return {
+            "общая_длина": self.length,
+            "байтов": self.length // 8,
+            "бит_1": self.ones,
+            "бит_0": zeros,
+            "соотношение_1_0": f"{self.ones}:{zeros}",
+            "процент_1": f"{(self.ones / self.length * 100):.1f}%",
+            "самая_длинная_последовательность_1": max(runs['1'], default=0),
+            "самая_длинная_последовательность_0": max(runs['0'], default=0),
+            "переходов": sum(runs['0'].values()) + sum(runs['1'].values()) - 1,
+            "серии_1": runs['1'],
+            "серии_0": runs['0'],
+            "автокорреляция": autocorrelation,
+            "байты": byte_groups if byte_groups is not None else ByteGroups(BitString.from_text(self.preview)),
+        }
+
+
+def analyze_file_range(path, start, end, packed=False, max_lag=8, chunk_size=1 << 16):
+    """Считает BitPatternStats для байтов [start, end) файла (задание для пула процессов)"""
+    stats = BitPatternStats(max_lag)
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            if packed:
+                stats.update(BitString.from_bytes(chunk))
+            else:
+                stats.update_text(clean_bit_text(chunk))
+    return stats
+
+
+class EncodingTables:
+    """Скомпилированные таблицы символ -> байты сразу для нескольких кодировок
+
+    Для каждого символа хранится кортеж его байтов во всех кодировках
+    (None, если символ в кодировке непредставим), поэтому слово во всех
+    кодировках получается за один проход по символам. Таблицы ASCII и
+    кириллицы строятся один раз на процесс и общие для всех экземпляров;
+    прочие символы дописываются при первой встрече.
+    """
+    ENCODINGS = ("utf-8", "cp1251", "koi8-r", "ascii", "utf-16-le", "utf-16-be")
+    # Общие таблицы: кортеж кодировок -> {символ: (байты, ...)}
+    _compiled = {}
+
+    def __init__(self, encodings=ENCODINGS, memo_size=4096):
+        self.encodings = tuple(codecs.lookup(encoding).name for encoding in encodings)
+        self.table = self._compiled.get(self.encodings)
+        if self.table is None:
+            self.table = self._compiled[self.encodings] = {}
+            for code in [*range(0x80), *range(0x400, 0x460)]:
+                self._compile_char(chr(code))
+        # Ограниченная LRU-память для целых слов
+        self.encode_all = lru_cache(maxsize=memo_size)(self._encode_all)
+
+    def _compile_char(self, char):
+        """Добавляет символ в таблицу"""
+        row = []
+        for encoding in self.encodings:
+            try:
+                row.append(char.encode(encoding))
+            except UnicodeEncodeError:
+                row.append(None)
+        row = self.table[char] = tuple(row)
+        return row
+
+    def _encode_all(self, word):
+        """Слово во всех кодировках: {кодировка: BitString или None}
+
+        Результат хранится в памяти слов и отдаётся всем вызывающим, поэтому
+        он только для чтения.
+        """
+        table = self.table
+        rows = [table.get(char) or self._compile_char(char) for char in word]
+        result = {}
+        for i, encoding in enumerate(self.encodings):
+            parts = [row[i] for row in rows]
+            result[encoding] = None if None in parts else BitString(b''.join(parts))
+        return MappingProxyType(result)
+
+    def encode(self, word, encoding):
+        """Слово в одной кодировке через общую память слов"""
+        return self.encode_all(word)[codecs.lookup(encoding).name]
+
+
+def hamming_distance(binary1, binary2):
+    """Расстояние Хэмминга по общим первым битам: (число различий, число сравненных бит)"""
+    binary1 = BitString.coerce(binary1)
+    binary2 = BitString.coerce(binary2)
+    compared = min(len(binary1), len(binary2))
+    num1 = binary1.to_int() >> (len(binary1) - compared)
+    num2 = binary2.to_int() >> (len(binary2) - compared)
+    return (num1 ^ num2).bit_count(), compared
+
+
+class HammingGroup:
+    """Коды одной длины в HammingIndex и их хеш-таблицы по кускам"""
+    __slots__ = ('words', 'first', 'varying', 'masks', 'flips', 'probes', 'tables')
+
+    def __init__(self, code):
+        # Код -> слово; у разных слов одной длины коды разные
+        self.words = {}
+        self.first = code
+        self.varying = 0
+        self.masks = None
+        self.flips = None
+        self.probes = None
+        self.tables = None
+
+    def build(self, chunk_bits):
+        """Строит таблицы: куски берутся только из меняющихся битов"""
+        positions = [bit for bit in range(self.varying.bit_length()) if self.varying >> bit & 1]
+        if chunk_bits is None:
+            # Ширина куска ~ log2(числа слов) + 3: меняющиеся биты символа
+            # зависимы (у кириллицы в UTF-8 ~0.7 бита энтропии на бит), так что
+            # корзины всё равно маленькие, а кусков и радиусов перебора меньше
+            chunk_bits = max(8, len(self.words).bit_length() + 3)
+        count = max(1, -(-len(positions) // chunk_bits))
         
-    def word_to_binary(self, word, encoding='utf-8'):
-        """Переводит слово в двоичный код (0 и 1)"""
+        # Куски чередуют позиции, чтобы в каждый попали биты всех символов
+        self.flips = [[1 << bit for bit in positions[i::count]] for i in range(count)]
+        self.masks = [sum(bits) for bits in self.flips]
+        self.probes = [[] for _ in self.flips]
+        
+        # В корзинах лежат сами коды: при поиске не нужен лишний переход по номеру
+        tables = [{} for _ in self.masks]
+        for code in self.words:
+            for table, mask in zip(tables, self.masks):
+                table.setdefault(code & mask, []).append(code)
+        # Кортеж хранит элементы в том же блоке памяти: при поиске на один промах кеша меньше
+        self.tables = [dict(zip(table, map(tuple, table.values()))) for table in tables]
+
+    def probe_masks(self, part, radius):
+        """XOR-маски всех сочетаний radius битов куска part (считаются один раз)"""
+        levels = self.probes[part]
+        while len(levels) <= radius:
+            levels.append([sum(flips) for flips in combinations(self.flips[part], len(levels))])
+        return levels[radius]
+
+
+class HammingIndex:
+    """Индекс ближайших по Хэммингу слов (multi-index hashing)
+
+    Коды слов одной длины в битах режутся на m кусков, и для каждого
+    куска строится хеш-таблица. Если расстояние до запроса меньше
+    m * (r + 1), то хотя бы один кусок отличается не более чем на r бит,
+    поэтому поиск перебирает соседей кусков с ростом r и останавливается,
+    как только найденные k слов гарантированно ближайшие. В куски идут
+    только биты, которые различаются хотя бы у двух слов (в UTF-8 у
+    кириллицы большая часть битов постоянна). Сравниваются только коды той
+    же длины, что и у запроса. Маски соседей куска для каждого r
+    считаются один раз и переиспользуются всеми запросами.
+    """
+
+    def __init__(self, encoding='utf-8', chunk_bits=None):
+        self.encoding = encoding
+        self.chunk_bits = chunk_bits
+        # Длина кода в битах -> HammingGroup
+        self.groups = {}
+
+    def __len__(self):
+        return sum(len(group.words) for group in self.groups.values())
+
+    def add(self, word):
+        """Добавляет слово в индекс (таблицы перестроятся при следующем поиске)"""
         try:
-            # Кодируем слово в байты
-            bytes_data = word.encode(encoding)
-            
-            # Преобразуем каждый байт в двоичную строку
-            binary_string = ''
-            for byte in bytes_data:
-                binary_string += format(byte, '08b')  # 8 бит с ведущими нулями
-            
-            return binary_string
+            data = word.encode(self.encoding)
         except UnicodeEncodeError:
+            return False
+        length = len(data) * 8
+        code = int.from_bytes(data, 'big')
+        
+        group = self.groups.get(length)
+        if group is None:
+            group = self.groups[length] = HammingGroup(code)
+        elif code in group.words:
+            return False
+        group.words[code] = word
+        group.varying |= code ^ group.first
+        group.tables = None
+        return True
+
+    def add_many(self, words):
+        """Добавляет слова из итератора; возвращает число новых"""
+        return sum(1 for word in words if self.add(word))
+
+    def load(self, path, encoding='utf-8'):
+        """Загружает словарь из файла (по слову в строке)"""
+        with open(path, encoding=encoding) as file:
+            added = self.add_many(line.strip() for line in file if line.strip())
+        self.build()
+        return added
+
+    def build(self):
+        """Заранее строит таблицы всех групп, чтобы первый поиск не ждал"""
+        for group in self.groups.values():
+            if group.tables is None:
+                group.build(self.chunk_bits)
+
+    def nearest(self, query, k=5):
+        """Возвращает до k пар (расстояние, слово), ближайших к запросу
+
+        При равных расстояниях первыми идут слова с меньшим кодом (для
+        UTF-8 - в порядке кодовых точек).
+        """
+        data = query.encode(self.encoding)
+        width = len(data) * 8
+        group = self.groups.get(width)
+        if group is None or k <= 0:
+            return []
+        if group.tables is None:
+            group.build(self.chunk_bits)
+        
+        code = int.from_bytes(data, 'big')
+        parts = group.flips
+        
+        best = []  # до k пар (расстояние, код) по возрастанию
+        limit = width  # расстояние k-го из найденных: кто дальше, в best не попадёт
+        seen = set()
+        count = len(parts)
+        for radius in range(max(map(len, parts)) + 1):
+            for part, (table, mask, bits) in enumerate(zip(group.tables, group.masks, parts)):
+                if radius > len(bits):
+                    continue
+                # Корзины всех соседей куска собираются за один проход на уровне C
+                keys = map((code & mask).__xor__, group.probe_masks(part, radius))
+                buckets = chain.from_iterable(filter(None, map(table.get, keys)))
+                found = set(filterfalse(seen.__contains__, buckets))
+                if found:
+                    seen |= found
+                    distances = list(map(int.bit_count, map(code.__xor__, found)))
+                    # Сортируются только кандидаты не дальше текущего k-го
+                    close = compress(zip(distances, found), map(limit.__ge__, distances))
+                    best = sorted(chain(best, close))[:k]
+                    if len(best) == k:
+                        limit = best[-1][0]
+                
+                # Не найденный код отличается больше чем на radius в кусках 0..part
+                # и не меньше чем на radius в остальных
+                if len(best) == k and limit < count * radius + part + 1:
+                    break
+            else:
+                continue
+            break
+        
+        return [(distance, group.words[code]) for distance, code in best]
+
+
+class LRUCache:
+    """Ограниченный кеш с вытеснением давно не использованных записей и счётчиками"""
+
+    def __init__(self, maxsize=1024):
+        if maxsize <= 0:
+            raise ValueError("Размер кеша должен быть положительным")
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        """Возвращает запись и делает её самой свежей"""
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Добавляет запись, вытесняя самую старую при переполнении"""
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Удаляет все записи (счётчики сохраняются)"""
+        self.data.clear()
+
+    def stats(self):
+        """Статистика кеша"""
+        requests = self.hits + self.misses
+        return {
+            "записей": len(self.data),
+            "максимум": self.maxsize,
+            "попаданий": self.hits,
+            "промахов": self.misses,
+            "вытеснений": self.evictions,
+            "доля_попаданий": self.hits / requests if requests else 0.0
+        }
+
+
+class BinaryWordCalculator:
+    def __init__(self, cache_size=None, errors="print"):
+        # Политика ошибок по умолчанию (см. ERROR_POLICIES)
+        self.errors = errors
+        # Кеш результатов (word_to_binary и calculate_binary_value), по умолчанию выключен
+        self.cache = LRUCache(cache_size) if cache_size else None
+        # Кодировка по умолчанию - UTF-8
+        self.encoding = 'utf-8'
+        # Таблицы символов для всех поддерживаемых кодировок (общие между экземплярами)
+        self.tables = EncodingTables()
+    
+    @property
+    def encoding(self):
+        return self._encoding
+    
+    @encoding.setter
+    def encoding(self, value):
+        # При смене кодировки старые результаты больше не нужны
+        if self.cache is not None and getattr(self, '_encoding', value) != value:
+            self.cache.clear()
+        self._encoding = value
+    
+    def cache_stats(self):
+        """Возвращает статистику кеша (или None, если кеш выключен)"""
+        return self.cache.stats() if self.cache is not None else None
+        
+    def word_to_binary(self, word, encoding='utf-8', errors=None):
+        """Переводит слово в двоичный код (0 и 1)
+
+        errors - политика ошибок (см. ERROR_POLICIES), по умолчанию self.errors.
+        """
+        errors = self._error_policy(errors)
+        
+        key = ("binary", word, encoding)
+        bits = self.cache.get(key) if self.cache is not None else None
+        if bits is None:
+            try:
+                # Кодируем слово в байты - они и есть упакованные биты
+                bits = BitString.from_bytes(word.encode(encoding))
+            except UnicodeEncodeError as e:
+                # Ошибки не кешируем, чтобы о них сообщалось каждый раз
+                return self._encode_failed(word, encoding, errors, e)
+            if self.cache is not None:
+                self.cache.put(key, bits)
+        
+        return ConversionResult(bits, []) if errors == "collect" else bits
+    
+    def _error_policy(self, errors):
+        """Проверяет политику ошибок"""
+        errors = errors or self.errors
+        if errors not in ERROR_POLICIES:
+            raise ValueError(f"Неизвестная политика ошибок: {errors}")
+        return errors
+    
+    def _encode_failed(self, word, encoding, errors, error):
+        """Обрабатывает ошибку кодирования по политике (медленный путь)"""
+        if errors == "print":
             print(f"Ошибка: Невозможно закодировать слово в {encoding}")
-            return ""
+            return BitString()
+        if errors == "strict":
+            raise error
+        if errors == "collect":
+            data, problems = codec_collect(lambda handler: word.encode(encoding, handler))
+            return ConversionResult(BitString.from_bytes(data), problems)
+        return BitString.from_bytes(word.encode(encoding, "replace" if errors == "replace" else "ignore"))
     
-    def binary_to_word(self, binary_string, encoding='utf-8'):
-        """Переводит двоичный код обратно в слово"""
+    def word_to_binary_all(self, word):
+        """Переводит слово сразу во все поддерживаемые кодировки за один проход
+
+        Возвращает неизменяемое отображение {кодировка: BitString}; None -
+        если слово в кодировке непредставимо. Для правки - dict(результат).
+        """
+        return self.tables.encode_all(word)
+    
+    def word_to_binary_many(self, words, encoding=None, packed=False, as_text=False):
+        """Переводит много слов в двоичный код за один проход
+
+        По умолчанию лениво выдаёт BatchItem для каждого слова (bits - BitString
+        или текст из 0 и 1 при as_text=True). При packed=True возвращает
+        PackedBatch с одним буфером на все слова. Ошибки не печатаются, а
+        возвращаются как EncodingFailure.
+        """
+        # Кодек ищем один раз на весь пакет
+        encode = codecs.getencoder(encoding or self.encoding)
+        if packed:
+            return self._pack_many(words, encode)
+        return self._iter_many(words, encode, as_text)
+    
+    def _iter_many(self, words, encode, as_text):
+        """Ленивое кодирование слов по одному"""
+        for index, word in enumerate(words):
+            try:
+                data = encode(word)[0]
+            except UnicodeEncodeError as e:
+                yield BatchItem(index, word, None, EncodingFailure(index, word, e.start, e.end, e.reason))
+                continue
+            bits = bytes_to_text(data) if as_text else BitString.from_bytes(data)
+            yield BatchItem(index, word, bits, None)
+    
+    def _pack_many(self, words, encode):
+        """Кодирование всех слов в общий буфер со смещениями"""
+        batch = PackedBatch()
+        buffer, offsets, errors = batch.buffer, batch.offsets, batch.errors
+        for index, word in enumerate(words):
+            try:
+                buffer += encode(word)[0]
+            except UnicodeEncodeError as e:
+                # Слово с ошибкой занимает пустой отрезок буфера
+                errors.append(EncodingFailure(index, word, e.start, e.end, e.reason))
+            offsets.append(len(buffer))
+        return batch
+    
+    def binary_to_word(self, binary_string, encoding='utf-8', errors=None):
+        """Переводит двоичный код обратно в слово
+
+        errors - политика ошибок (см. ERROR_POLICIES), по умолчанию self.errors.
+        Сначала пробуется строгое декодирование, так что на корректных данных
+        политика ничего не стоит.
+        """
+        errors = self._error_policy(errors)
+        problems = []
+        
         try:
-            # Проверяем, что длина строки кратна 8
-            if len(binary_string) % 8 != 0:
-                print("Ошибка: Длина двоичной строки должна быть кратна 8")
-                return ""
-            
-            # Разбиваем строку на байты (по 8 символов)
-            bytes_list = []
-            for i in range(0, len(binary_string), 8):
-                byte_str = binary_string[i:i+8]
-                byte_value = int(byte_str, 2)
-                bytes_list.append(byte_value)
-            
-            # Преобразуем байты в строку
-            bytes_data = bytes(bytes_list)
-            return bytes_data.decode(encoding)
-        except (ValueError, UnicodeDecodeError) as e:
-            print(f"Ошибка при декодировании: {e}")
+            bits = BitString.coerce(binary_string)
+        except ValueError as e:
+            # Позиция в битах: пробелы между байтами не считаются
+            digits = (char for char in binary_string if not char.isspace())
+            position = next((i for i, char in enumerate(digits) if char not in '01'), 0)
+            return self._decode_failed(errors, e, ConversionError(position, position + 1, str(e)))
+        
+        # Проверяем, что длина строки кратна 8
+        tail = len(bits) % 8
+        data = bits.to_bytes()
+        if tail:
+            message = "Длина двоичной строки должна быть кратна 8"
+            if errors in ("print", "strict"):
+                return self._decode_failed(errors, ValueError(message), None, f"Ошибка: {message}")
+            # Неполный последний байт отбрасываем
+            problems.append(ConversionError(len(bits) - tail, len(bits), message))
+            data = data[:-1]
+        
+        try:
+            # Биты уже упакованы в байты - остаётся только декодировать
+            text = data.decode(encoding)
+        except UnicodeDecodeError as e:
+            if errors in ("print", "strict"):
+                return self._decode_failed(errors, e, None)
+            if errors == "collect":
+                text, found = codec_collect(lambda handler: data.decode(encoding, handler))
+                problems[:0] = [ConversionError(err.start * 8, err.end * 8, err.reason) for err in found]
+            else:
+                text = data.decode(encoding, "replace" if errors == "replace" else "ignore")
+        
+        if tail and errors in ("replace", "collect"):
+            text += '\ufffd'
+        return ConversionResult(text, problems) if errors == "collect" else text
+    
+    def _decode_failed(self, errors, error, problem, message=None):
+        """Ошибка, из-за которой не декодируется весь код (медленный путь)"""
+        if errors == "print":
+            print(message or f"Ошибка при декодировании: {error}")
             return ""
+        if errors == "strict":
+            raise error
+        if errors == "collect":
+            return ConversionResult('\ufffd', [problem])
+        return '\ufffd' if errors == "replace" else ""
+    
+    def binary_to_word_stream(self, source, encoding=None, chunk_size=1 << 16):
+        """Потоково декодирует текст из 0 и 1 из файла (или sys.stdin)
+
+        Читает source кусками по chunk_size символов, упаковывает биты в
+        байты и декодирует инкрементальным декодером, так что многобайтовые
+        символы на границе кусков собираются правильно. Выдаёт куски текста;
+        память не зависит от размера входа.
+        """
+        decoder = codecs.getincrementaldecoder(encoding or self.encoding)()
+        carry = ''
+        
+        for chunk in read_bit_chunks(source, chunk_size):
+            # Остаток с прошлого куска - в начало
+            bits = carry + chunk
+            whole = len(bits) - len(bits) % 8
+            carry = bits[whole:]
+            if whole:
+                data = int(bits[:whole], 2).to_bytes(whole // 8, 'big')
+                text = decoder.decode(data)
+                if text:
+                    yield text
+        
+        if carry:
+            raise ValueError("Длина двоичной строки должна быть кратна 8")
+        
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield text
+    
+    def decode_binary_stream(self, source, target, encoding=None, chunk_size=1 << 16):
+        """Декодирует поток 0 и 1 из source и пишет текст в target"""
+        written = 0
+        for text in self.binary_to_word_stream(source, encoding, chunk_size):
+            target.write(text)
+            written += len(text)
+        return written
     
     def calculate_binary_value(self, binary_string, operation="sum"):
         """Выполняет операции с двоичной строкой"""
         if not binary_string:
             return 0
         
+        bits = BitString.coerce(binary_string)
+        if self.cache is not None:
+            # Ключ - длина и упакованные байты: хеш bytes считается один раз и
+            # запоминается, а сам BitString в ключе не нужен
+            key = ("stats", len(bits), bits.to_bytes())
+            stats = self.cache.get(key)
+            if stats is None:
+                stats = self._binary_stats(bits)
+                self.cache.put(key, stats)
+            # Копия, чтобы изменения у вызывающего не попали в кеш
+            return dict(stats)
+        return self._binary_stats(bits)
+    
+    def _binary_stats(self, bits):
+        """Считает статистику битовой строки без кеша"""
         # Преобразуем двоичную строку в целое число
-        numeric_value = int(binary_string, 2)
+        numeric_value = bits.to_int()
+        ones = numeric_value.bit_count()
         
         # Считаем статистику
         stats = {
-            "длина_бит": len(binary_string),
-            "количество_1": binary_string.count('1'),
-            "количество_0": binary_string.count('0'),
+            "длина_бит": len(bits),
+            "количество_1": ones,
+            "количество_0": len(bits) - ones,
             "числовое_значение": numeric_value
         }
         
         return stats
     
-    def binary_operations(self, binary1, binary2, operation="xor"):
-        """Выполняет бинарные операции между двумя двоичными строками"""
-        # Приводим к одинаковой длине, добавляя ведущие нули
-        max_len = max(len(binary1), len(binary2))
-        bin1 = binary1.zfill(max_len)
-        bin2 = binary2.zfill(max_len)
+    def binary_operations(self, binary1, binary2=None, operation="xor", width=None, modulus=None,
+                          signed=False):
+        """Выполняет бинарные операции между двумя двоичными строками
+
+        Побитовые операции (xor, and, or, nand, nor, xnor, not) и сдвиги
+        (shl, shr, sar, rol, ror) выполняются над целым числом сразу по всей
+        ширине. Для сдвигов второй аргумент - величина сдвига (число или
+        двоичная строка). width задаёт разрядность результата; по умолчанию
+        берётся длина большего операнда. Арифметика (add, subtract, multiply,
+        divide, mod, power по модулю modulus) без width не ограничена по
+        разрядности, а отрицательная разность обнуляется; с signed=True
+        операнды читаются в дополнительном коде. Флаг переполнения
+        арифметики возвращает binary_arithmetic.
+        """
+        if operation in ARITHMETIC_OPERATIONS:
+            return self.binary_arithmetic(binary1, binary2, operation, width, modulus, signed).to_bits()
+        
+        binary1 = BitString.coerce(binary1)
+        
+        num1 = binary1.to_int()
+        
+        if operation in SHIFT_OPERATIONS:
+            # Сдвиги и вращения: второй операнд - количество позиций
+            if isinstance(binary2, int):
+                shift = binary2
+            else:
+                shift = BitString.coerce(binary2).to_int() if binary2 is not None else 1
+            width = width or len(binary1)
+            if width < 0:
+                raise ValueError(f"Разрядность не может быть отрицательной: {width}")
+            if width == 0:
+                # Пустую строку сдвигать некуда
+                return BitString()
+            return BitString.from_int(self._shift(num1 & ((1 << width) - 1), shift, operation, width), width)
+        
+        binary2 = BitString.coerce(binary2) if binary2 is not None else BitString()
+        num2 = binary2.to_int()
         
-        result = ""
+        # Приводим к одинаковой длине (ведущие нули получаются сами собой)
+        width = width or max(len(binary1), len(binary2))
+        mask = (1 << width) - 1
         
         if operation == "xor":
-            for b1, b2 in zip(bin1, bin2):
-                result += '1' if b1 != b2 else '0'
+            result = num1 ^ num2
         
         elif operation == "and":
-            for b1, b2 in zip(bin1, bin2):
-                result += '1' if b1 == '1' and b2 == '1' else '0'
+            result = num1 & num2
         
         elif operation == "or":
-            for b1, b2 in zip(bin1, bin2):
-                result += '1' if b1 == '1' or b2 == '1' else '0'
+            result = num1 | num2
+        
+        elif operation == "nand":
+            result = ~(num1 & num2)
+        
+        elif operation == "nor":
+            result = ~(num1 | num2)
+        
+        elif operation == "xnor":
+            result = ~(num1 ^ num2)
         
-        elif operation == "add":
-            # Арифметическое сложение чисел
-            num1 = int(binary1, 2) if binary1 else 0
-            num2 = int(binary2, 2) if binary2 else 0
-            result = format(num1 + num2, 'b')
+        elif operation == "not":
+            result = ~num1
+        
+        else:
+            return BitString()
+        
+        return BitString.from_int(result & mask, width)
+    
+    def binary_arithmetic(self, binary1, binary2, operation="add", width=None, modulus=None,
+                          signed=False):
+        """Арифметика над двоичными строками; результат - BinaryNumber с флагом overflow"""
+        if signed and binary2 is not None and not isinstance(binary2, (int, BinaryNumber)):
+            # Второй операнд тоже в дополнительном коде, а не беззнаковый; оба
+            # дополняются ведущими нулями до общей разрядности
+            binary2 = BitString.coerce(binary2)
+            if width is None:
+                width = max(len(BitString.coerce(binary1)), len(binary2))
+            binary2 = BinaryNumber.from_bits(binary2, width, signed)
+        number = BinaryNumber.from_bits(binary1, width, signed)
+        return self.arithmetic(number, binary2, operation, modulus)
+    
+    def arithmetic(self, number, operand, operation="add", modulus=None):
+        """Арифметика над BinaryNumber; результат остаётся числом для цепочек"""
+        if not isinstance(number, BinaryNumber):
+            number = BinaryNumber.from_bits(number)
         
+        if operation == "add":
+            return number + operand
         elif operation == "subtract":
-            num1 = int(binary1, 2) if binary1 else 0
-            num2 = int(binary2, 2) if binary2 else 0
-            result = format(max(num1 - num2, 0), 'b')
+            return number - operand
+        elif operation == "multiply":
+            return number * operand
+        elif operation == "divide":
+            return number // operand
+        elif operation == "mod":
+            return number % operand
+        elif operation == "power":
+            return pow(number, operand, modulus)
+        raise ValueError(f"Неизвестная арифметическая операция: {operation}")
+    
+    def _shift(self, value, shift, operation, width):
+        """Сдвиг или вращение значения в пределах width бит"""
+        mask = (1 << width) - 1
+        
+        if operation == "shl":
+            return (value << shift) & mask
+        
+        if operation == "shr":
+            return value >> shift
         
-        return result
+        if operation == "sar":
+            # Арифметический сдвиг: размножаем знаковый (старший) бит
+            shift = min(shift, width)
+            if value >> (width - 1) & 1:
+                return (value >> shift) | (mask ^ (mask >> shift))
+            return value >> shift
+        
+        # Вращения
+        shift %= width
+        if operation == "ror":
+            shift = (width - shift) % width
+        return ((value << shift) | (value >> (width - shift))) & mask
     
-    def analyze_binary_pattern(self, binary_string):
-        """Анализирует паттерны в двоичной строке"""
+    def analyze_binary_pattern(self, binary_string, max_lag=8, chunk_bits=1 << 19):
+        """Анализирует паттерны в двоичной строке за один проход"""
         if not binary_string:
             return {}
         
-        analysis = {
-            "общая_длина": len(binary_string),
-            "байтов": len(binary_string) // 8,
-            "бит_1": binary_string.count('1'),
-            "бит_0": binary_string.count('0'),
-            "соотношение_1_0": f"{binary_string.count('1')}:{binary_string.count('0')}",
-            "процент_1": f"{(binary_string.count('1') / len(binary_string) * 100):.1f}%",
-            "самая_длинная_последовательность_1": max(map(len, binary_string.split('0'))),
-            "самая_длинная_последовательность_0": max(map(len, binary_string.split('1')))
-        }
+        bits = BitString.coerce(binary_string)
+        stats = BitPatternStats(max_lag)
+        
+        # Куски кратны 8 битам, поэтому режутся без распаковки
+        for start in range(0, len(bits), chunk_bits):
+            stats.update(bits[start:start + chunk_bits])
+        
+        return stats.result(ByteGroups(bits))
+    
+    def analyze_binary_stream(self, source, packed=False, max_lag=8, chunk_size=1 << 16):
+        """Анализирует поток по кускам, не загружая его в память
+
+        Если packed=True, source отдаёт сырые байты (файл в режиме 'rb'),
+        иначе - текст из 0 и 1. В поле "байты" попадают только первые байты.
+        """
+        stats = BitPatternStats(max_lag)
         
-        # Группируем по байтам
-        bytes_list = [binary_string[i:i+8] for i in range(0, len(binary_string), 8)]
-        analysis["байты"] = bytes_list
+        if packed:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                stats.update(BitString.from_bytes(chunk))
+        else:
+            for chunk in read_bit_chunks(source, chunk_size):
+                stats.update_text(chunk)
         
-        return analysis
+        return stats.result()
     
-    def visualize_binary(self, binary_string, bytes_per_line=4):
+    def analyze_binary_file(self, path, packed=False, max_lag=8, workers=None, shard_size=1 << 26):
+        """Анализирует большой файл параллельно в пуле процессов
+
+        Файл режется на куски по shard_size байт, каждый процесс считает
+        свою BitPatternStats, а результаты сливаются по порядку через merge.
+        Результат совпадает с analyze_binary_stream на том же файле.
+        """
+        size = os.path.getsize(path)
+        shards = [(start, min(start + shard_size, size)) for start in range(0, size, shard_size)]
+        
+        if len(shards) <= 1 or workers == 1:
+            results = [analyze_file_range(path, start, end, packed, max_lag) for start, end in shards]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(analyze_file_range, repeat(path), *zip(*shards),
+                                        repeat(packed), repeat(max_lag)))
+        
+        stats = BitPatternStats(max_lag)
+        for shard_stats in results:
+            stats.merge(shard_stats)
+        return stats.result()
+    
+    def bit_similarity(self, binary1, binary2):
+        """Сходство двух двоичных кодов по общим первым битам (XOR + popcount)"""
+        distance, compared = hamming_distance(binary1, binary2)
+        return {
+            "расстояние_хэмминга": distance,
+            "сравнено_бит": compared,
+            "сходство": (compared - distance) / compared * 100 if compared else 0.0
+        }
+    
+    def visualize_binary(self, binary_string, bytes_per_line=4, offset=0, limit=None,
+                         file=None, style="plain"):
         """Визуализирует двоичный код в виде таблицы"""
+        file = file or sys.stdout
         if not binary_string:
-            print("Пустая строка")
+            file.write("Пустая строка\n")
             return
         
-        bytes_list = [binary_string[i:i+8] for i in range(0, len(binary_string), 8)]
+        file.write("\n" + "="*60 + "\nВИЗУАЛИЗАЦИЯ ДВОИЧНОГО КОДА\n" + "="*60 + "\n")
+        self.render_binary(binary_string, file, offset, limit, bytes_per_line, style)
+    
+    def render_binary(self, binary_string, file, offset=0, limit=None, bytes_per_line=4,
+                      style="plain"):
+        """Рисует байты [offset, offset + limit) в file: plain, ansi или html
+
+        Каждый блок строк собирается в памяти и пишется одним вызовом
+        write, а из большого буфера распаковываются только байты окна.
+        """
+        to_visual = VISUAL_STYLES[style]
+        bits = BitString.coerce(binary_string)
+        total = (len(bits) + 7) // 8
+        offset = max(0, min(offset, total))
+        end = total if limit is None else min(total, offset + limit)
+        
+        # Окно начинается на границе байта, поэтому срез не распаковывает весь буфер
+        text = str(bits[offset * 8:end * 8])
+        bytes_list = [text[i:i+8] for i in range(0, len(text), 8)]
+        escape = html_escape if style == "html" else str
         
-        print("\n" + "="*60)
-        print("ВИЗУАЛИЗАЦИЯ ДВОИЧНОГО КОДА")
-        print("="*60)
+        if style == "html":
+            file.write('<pre class="binary">\n')
         
+        # Байты и блоки нумеруются от начала всего буфера, а не окна
         for i in range(0, len(bytes_list), bytes_per_line):
             line_bytes = bytes_list[i:i+bytes_per_line]
-            
-            # Выводим байты
-            print(f"\nБайты {i//bytes_per_line + 1}:")
-            print("  ".join(f"[{j+1:2d}] {byte}" for j, byte in enumerate(line_bytes)))
-            
-            # Выводим десятичные значения
-            print("Десятичные: ", end="")
-            for byte in line_bytes:
-                if byte:
-                    print(f"{int(byte, 2):3d} ", end="")
-            print()
-            
-            # Визуализация
-            print("Визуально:   ", end="")
-            for byte in line_bytes:
-                for bit in byte:
-                    print("█" if bit == '1' else "░", end="")
-                print(" ", end="")
-            print()
+            first = offset + i + 1
+            last = first + len(line_bytes) - 1
+            span = f"{first}-{last}" if last > first else f"{first}"
+            lines = [
+                escape(f"\nБайты {span}:"),
+                escape("  ".join(f"[{first + j:2d}] {byte}" for j, byte in enumerate(line_bytes))),
+                "Десятичные: " + "".join(f"{int(byte, 2):3d} " for byte in line_bytes),
+                "Визуально:   " + "".join(byte.translate(to_visual) + " " for byte in line_bytes),
+            ]
+            file.write("\n".join(lines) + "\n")
+        
+        if style == "html":
+            file.write("</pre>\n")
     
     def print_menu(self):
         """Выводит меню программы"""
@@ -165,6 +1447,192 @@ class BinaryWordCalculator:
         print("9. Выход")
         print("="*60)
 
+# Поля CSV для каждой подкоманды пакетного режима
+CLI_FIELDS = {
+    "encode": ["строка", "слово", "двоичный_код", "длина_бит", "ошибка"],
+    "decode": ["строка", "двоичный_код", "слово", "ошибка"],
+    "analyze": ["строка", "общая_длина", "байтов", "бит_1", "бит_0", "процент_1",
+                "самая_длинная_последовательность_1", "самая_длинная_последовательность_0",
+                "переходов", "ошибка"],
+    "op": ["строка", "операнд_1", "операнд_2", "операция", "результат", "длина_бит", "переполнение",
+           "ошибка"],
+    "compare": ["строка", "слово_1", "слово_2", "расстояние_хэмминга", "сравнено_бит", "сходство", "ошибка"],
+}
+
+
+def read_records(files, encoding='utf-8'):
+    """Читает непустые строки из файлов (или stdin): пары (номер строки, текст)"""
+    with fileinput.input(files or ('-',), encoding=encoding) as lines:
+        for number, line in enumerate(lines, 1):
+            line = line.rstrip('\r\n')
+            if line.strip():
+                yield number, line
+
+
+def cli_records(calculator, args):
+    """Выполняет подкоманду над всеми входными строками, выдаёт словари-записи"""
+    records = read_records(args.files, args.input_encoding)
+    
+    if args.command == "encode":
+        # Слова кодируются лениво по одному, номера строк идут в очередь рядом
+        numbers = deque()
+        words = (numbers.append(number) or line.strip() for number, line in records)
+        for item in calculator.word_to_binary_many(words, args.encoding):
+            record = {"строка": numbers.popleft(), "слово": item.word}
+            if item.error:
+                record["ошибка"] = item.error.reason
+            else:
+                record["двоичный_код"] = str(item.bits)
+                record["длина_бит"] = len(item.bits)
+            yield record
+        return
+    
+    for number, line in records:
+        record = {"строка": number}
+        try:
+            if args.command == "decode":
+                record["двоичный_код"] = ''.join(line.split())
+                result = calculator.binary_to_word(line, args.encoding, args.errors)
+                if args.errors == "collect":
+                    result, problems = result
+                    if problems:
+                        record["ошибка"] = "; ".join(f"биты {err.start}-{err.end}: {err.reason}"
+                                                     for err in problems)
+                record["слово"] = result
+            
+            elif args.command == "analyze":
+                text = line.strip()
+                bits = calculator.word_to_binary(text, args.encoding) if args.words else BitString.from_text(text)
+                analysis = calculator.analyze_binary_pattern(bits)
+                analysis.pop("байты", None)
+                record.update(analysis)
+            
+            elif args.command == "op":
+                operands = line.split()
+                if args.words:
+                    bits = [BitString.from_bytes(word.encode(args.encoding)) for word in operands]
+                else:
+                    bits = [BitString.from_text(operand) for operand in operands]
+                # not - один операнд; сдвиг - операнд и необязательная величина сдвига
+                if args.operation == "not":
+                    expected = (1,)
+                elif args.operation in SHIFT_OPERATIONS:
+                    expected = (1, 2)
+                else:
+                    expected = (2,)
+                if len(bits) not in expected:
+                    raise ValueError(f"Для {args.operation} нужно операндов: "
+                                     f"{' или '.join(map(str, expected))}, в строке {len(bits)}")
+                if len(bits) == 1:
+                    bits.append(args.shift if args.operation in SHIFT_OPERATIONS else None)
+                overflow = None
+                if args.operation in ARITHMETIC_OPERATIONS:
+                    number = calculator.binary_arithmetic(bits[0], bits[1], args.operation, args.width,
+                                                          args.modulus, args.signed)
+                    result, overflow = number.to_bits(), number.overflow
+                else:
+                    result = calculator.binary_operations(bits[0], bits[1], args.operation, args.width)
+                record.update({
+                    "операнд_1": operands[0],
+                    "операнд_2": operands[1] if len(operands) > 1 else "",
+                    "операция": args.operation,
+                    "результат": str(result),
+                    "длина_бит": len(result),
+                })
+                if overflow is not None:
+                    record["переполнение"] = overflow
+            
+            elif args.command == "compare":
+                words = line.split()
+                if len(words) != 2:
+                    raise ValueError("В строке должно быть два слова")
+                word1, word2 = words
+                similarity = calculator.bit_similarity(word1.encode(args.encoding), word2.encode(args.encoding))
+                record.update({"слово_1": word1, "слово_2": word2})
+                record.update(similarity)
+        
+        except (ValueError, UnicodeError, ArithmeticError) as e:
+            record["ошибка"] = str(e)
+        yield record
+
+
+class IntermixedParser(argparse.ArgumentParser):
+    """Парсер подкоманды: входные файлы можно указывать и после опций
+
+    argparse отдаёт позиционные аргументы подкоманде сразу после первого
+    из них (op xor --words pairs.txt не разбирается), поэтому подкоманды
+    разбираются через parse_known_intermixed_args. Он сам вызывает
+    parse_known_args, и на этот внутренний вызов работает обычный разбор.
+    """
+    _intermixed = False
+
+    def parse_known_args(self, args=None, namespace=None):
+        if self._intermixed:
+            return super().parse_known_args(args, namespace)
+        self._intermixed = True
+        try:
+            return self.parse_known_intermixed_args(args, namespace)
+        finally:
+            self._intermixed = False
+
+
+def run_cli(argv=None):
+    """Пакетный режим без меню: читает файлы или stdin, пишет JSONL или CSV в stdout"""
+    parser = argparse.ArgumentParser(
+        prog="binary_calculator.py",
+        description="Бинарный калькулятор слов: пакетная обработка построчных данных")
+    parser.add_argument("--encoding", default="utf-8",
+                        help="кодировка слов (utf-8, cp1251, ascii, ...)")
+    parser.add_argument("--input-encoding", default="utf-8", help="кодировка входных файлов")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl", help="формат вывода")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="размер LRU-кеша результатов (0 - без кеша)")
+    commands = parser.add_subparsers(dest="command", required=True, parser_class=IntermixedParser)
+    
+    encode = commands.add_parser("encode", help="слова -> двоичный код")
+    decode = commands.add_parser("decode", help="двоичный код -> слова")
+    decode.add_argument("--errors", choices=ERROR_POLICIES[1:], default="strict",
+                        help="что делать с испорченными строками (strict - запись с ошибкой)")
+    analyze = commands.add_parser("analyze", help="статистика двоичного кода")
+    analyze.add_argument("--words", action="store_true", help="на входе слова, а не двоичный код")
+    op = commands.add_parser("op", help="бинарная операция над парами операндов в строке")
+    op.add_argument("operation", choices=BITWISE_OPERATIONS + SHIFT_OPERATIONS + ARITHMETIC_OPERATIONS,
+                    metavar="operation", help=", ".join(BITWISE_OPERATIONS + SHIFT_OPERATIONS +
+                                                        ARITHMETIC_OPERATIONS))
+    op.add_argument("--words", action="store_true", help="операнды - слова, а не двоичный код")
+    op.add_argument("--width", type=int, default=None, help="разрядность результата")
+    op.add_argument("--shift", type=int, default=1, help="сдвиг, если в строке один операнд")
+    op.add_argument("--modulus", type=int, default=None, help="модуль для power")
+    op.add_argument("--signed", action="store_true",
+                    help="арифметика над числами в дополнительном коде")
+    compare = commands.add_parser("compare", help="сходство битов пар слов")
+    for command in (encode, decode, analyze, op, compare):
+        command.add_argument("files", nargs="*", help="входные файлы (по умолчанию stdin)")
+    
+    args = parser.parse_args(argv)
+    calculator = BinaryWordCalculator(cache_size=args.cache_size)
+    
+    # Большой буфер вывода: записи пишутся в память и сбрасываются блоками
+    try:
+        with open(sys.stdout.fileno(), "w", encoding="utf-8", newline="",
+                  buffering=1 << 20, closefd=False) as out:
+            if args.format == "csv":
+                writer = csv.DictWriter(out, CLI_FIELDS[args.command], extrasaction="ignore")
+                writer.writeheader()
+                for record in cli_records(calculator, args):
+                    writer.writerow(record)
+            else:
+                dumps = json.JSONEncoder(ensure_ascii=False).encode
+                for record in cli_records(calculator, args):
+                    out.write(dumps(record))
+                    out.write("\n")
+    except OSError as e:
+        # Например, входной файл не найден: уже выданные записи остаются в выводе
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 def main():
     calculator = BinaryWordCalculator()
     
@@ -192,7 +1660,8 @@ def main():
                     print(f"Двоичный код ({len(binary)} бит):")
                     
                     # Форматируем вывод с пробелами между байтами
-                    formatted = ' '.join([binary[i:i+8] for i in range(0, len(binary), 8)])
+                    text = str(binary)
+                    formatted = ' '.join([text[i:i+8] for i in range(0, len(text), 8)])
                     print(formatted)
                     
                     # Краткая статистика
@@ -223,7 +1692,7 @@ def main():
                     binary = calculator.word_to_binary(binary_input, calculator.encoding)
                     print(f"Слово '{binary_input}' преобразовано в двоичный код")
                 else:
-                    binary = binary_input.replace(" ", "")
+                    binary = BitString.from_text(binary_input)
                 
                 if binary:
                     analysis = calculator.analyze_binary_pattern(binary)
@@ -238,7 +1707,7 @@ def main():
                     if "байты" in analysis and analysis["байты"]:
                         print(f"\nПервые 5 байт:")
                         for i, byte in enumerate(analysis["байты"][:5]):
-                            print(f"  Байт {i+1}: {byte} = {int(byte, 2)} десятичное")
+                            print(f"  Байт {i+1}: {byte} = {int(byte)} десятичное")
             
             elif choice == "4":
                 word = input("Введите слово для визуализации: ").strip()
@@ -274,6 +1743,9 @@ def main():
                         ("xor", "Исключающее ИЛИ"),
                         ("and", "Логическое И"),
                         ("or", "Логическое ИЛИ"),
+                        ("nand", "И-НЕ"),
+                        ("nor", "ИЛИ-НЕ"),
+                        ("xnor", "Исключающее ИЛИ-НЕ"),
                         ("add", "Арифметическая сумма"),
                     ]
                     
@@ -321,10 +1793,9 @@ def main():
                     print(f"'{word2}': {binary2[:32]}")
                     
                     # Считаем сходство
-                    min_len = min(len(binary1), len(binary2))
-                    matches = sum(1 for i in range(min_len) if binary1[i] == binary2[i])
-                    similarity = (matches / min_len) * 100
-                    print(f"\nСходство битов: {similarity:.1f}%")
+                    similarity = calculator.bit_similarity(binary1, binary2)
+                    print(f"\nСходство битов: {similarity['сходство']:.1f}%")
+                    print(f"Расстояние Хэмминга: {similarity['расстояние_хэмминга']}")
             
             elif choice == "7":
                 print(f"\nТекущая кодировка: {calculator.encoding}")
@@ -332,11 +1803,23 @@ def main():
                 print("1. UTF-8 (рекомендуется, универсальная)")
                 print("2. Windows-1251 (кириллица, 1 байт на символ)")
                 print("3. ASCII (только английские буквы)")
+                print("4. KOI8-R (кириллица, 1 байт на символ)")
+                print("5. UTF-16LE (2 байта на символ, младший байт первым)")
+                print("6. UTF-16BE (2 байта на символ, старший байт первым)")
+                print("7. Показать слово во всех кодировках")
                 
-                enc_choice = input("Выберите кодировку (1-3): ").strip()
-                encodings = {"1": "utf-8", "2": "cp1251", "3": "ascii"}
+                enc_choice = input("Выберите кодировку (1-7): ").strip()
+                encodings = {"1": "utf-8", "2": "cp1251", "3": "ascii",
+                             "4": "koi8-r", "5": "utf-16-le", "6": "utf-16-be"}
                 
-                if enc_choice in encodings:
+                if enc_choice == "7":
+                    word = input("Введите слово: ").strip()
+                    for encoding, binary in calculator.word_to_binary_all(word).items():
+                        if binary is None:
+                            print(f"{encoding:<10} невозможно закодировать")
+                        else:
+                            print(f"{encoding:<10} ({len(binary)} бит): {binary}")
+                elif enc_choice in encodings:
                     calculator.encoding = encodings[enc_choice]
                     print(f"Кодировка изменена на: {calculator.encoding}")
                 else:
@@ -354,7 +1837,7 @@ def main():
                         print(f"Двоичный код ({len(binary)} бит):")
                         
                         # Показываем первые 64 бита
-                        preview = binary[:64] + "..." if len(binary) > 64 else binary
+                        preview = str(binary[:64]) + "..." if len(binary) > 64 else str(binary)
                         formatted = ' '.join([preview[i:i+8] for i in range(0, len(preview), 8)])
                         print(formatted)
                         
@@ -388,4 +1871,7 @@ def main():
             input("Нажмите Enter для продолжения...")
 
 if __name__ == "__main__":
-    main()  
+    # С аргументами - пакетный режим, без них - интерактивное меню
+    if len(sys.argv) > 1:
+        sys.exit(run_cli())
+    main()
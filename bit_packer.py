@@ -0,0 +1,123 @@
+import argparse
+import mmap
+import os
+import sys
+
+
+# Символы-разделители, которые пропускаются в текстовых дампах битов
+SEPARATORS = b" \t\r\n\v\f,;:|_-."
+
+# Размер куска по умолчанию: 8 МБ текста (1 МБ упакованных байтов)
+CHUNK_SIZE = 1 << 23
+
+
+def map_file(file):
+    """Отображает файл в память только для чтения (пустой файл - пустые байты)"""
+    if os.fstat(file.fileno()).st_size == 0:
+        return b""
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def pack_bits(source, target, chunk_size=CHUNK_SIZE, pad=True):
+    """Упаковывает текст из 0 и 1 из source в байты в target
+
+    source отображается в память и читается кусками; разделители
+    удаляются через bytes.translate, а биты куска разбираются одним
+    вызовом int(..., 2). Неполный последний байт дополняется нулями
+    справа (pad=True) или считается ошибкой. Возвращает число бит.
+    """
+    total = 0
+    carry = b""
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        data = map_file(src)
+        try:
+            for start in range(0, len(data), chunk_size):
+                chunk = data[start:start + chunk_size].translate(None, SEPARATORS)
+                if chunk.translate(None, b"01"):
+                    position = start + next(i for i, byte in enumerate(data[start:start + chunk_size])
+                                            if byte not in b"01" + SEPARATORS)
+                    raise ValueError(f"Недопустимый символ в позиции {position}: "
+                                     "двоичный код должен содержать только 0 и 1")
+
+                bits = carry + chunk
+                whole = len(bits) - len(bits) % 8
+                carry = bits[whole:]
+                if whole:
+                    dst.write(int(bits[:whole], 2).to_bytes(whole // 8, "big"))
+                total += len(chunk)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+        if carry:
+            if not pad:
+                raise ValueError("Длина двоичной строки должна быть кратна 8")
+            dst.write(bytes([int(carry.ljust(8, b"0"), 2)]))
+
+    return total
+
+
+def unpack_bits(source, target, chunk_size=CHUNK_SIZE // 8, wrap=0):
+    """Распаковывает байты из source в текст из 0 и 1 в target
+
+    Каждый кусок переводится в текст одним форматированием целого числа.
+    wrap - число бит в строке вывода (0 - без переводов строк). Возвращает
+    число бит.
+    """
+    if wrap and wrap % 8:
+        raise ValueError("Ширина строки должна быть кратна 8 битам")
+    if wrap:
+        # Кусок должен содержать целое число строк
+        line_bytes = wrap // 8
+        chunk_size = max(line_bytes, chunk_size - chunk_size % line_bytes)
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        data = map_file(src)
+        total = len(data) * 8
+        try:
+            for start in range(0, len(data), chunk_size):
+                chunk = data[start:start + chunk_size]
+                text = format(int.from_bytes(chunk, "big"), f"0{len(chunk) * 8}b").encode("ascii")
+                if wrap:
+                    text = b"\n".join(text[i:i + wrap] for i in range(0, len(text), wrap)) + b"\n"
+                dst.write(text)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Упаковка текстовых дампов из 0 и 1 в байты и обратно")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack = commands.add_parser("pack", help="текст из 0 и 1 -> байты")
+    pack.add_argument("source")
+    pack.add_argument("target")
+    pack.add_argument("--strict", action="store_true",
+                      help="ошибка, если число бит не кратно 8 (иначе дополняется нулями)")
+
+    unpack = commands.add_parser("unpack", help="байты -> текст из 0 и 1")
+    unpack.add_argument("source")
+    unpack.add_argument("target")
+    unpack.add_argument("--wrap", type=int, default=0, help="бит в строке (0 - одной строкой)")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "pack":
+            bits = pack_bits(args.source, args.target, pad=not args.strict)
+        else:
+            bits = unpack_bits(args.source, args.target, wrap=args.wrap)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Готово: {bits} бит ({bits // 8} байт)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,142 @@
 import math
 import hashlib
 from datetime import datetime
+import csv
 import json
 import os
 
+# Каталог звёзд по умолчанию: CSV рядом с программой
+DEFAULT_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'star_catalog.csv')
+
+# Столбцы CSV: прямое восхождение в часах, склонение в градусах, название.
+# Подходят и выгрузки HYG Database (proper, ra, dec, hip, hd).
+NAME_COLUMNS = ('name', 'proper', 'название')
+DESIGNATION_COLUMNS = (('bf', '{}'), ('hip', 'HIP {}'), ('hd', 'HD {}'), ('id', 'Звезда {}'))
+
+
+def unit_vector(ra_hours, dec_degrees):
+    """Точка небесной сферы в виде единичного вектора (x, y, z)"""
+    ra = math.radians(ra_hours * 15)
+    dec = math.radians(dec_degrees)
+    cos_dec = math.cos(dec)
+    return (cos_dec * math.cos(ra), cos_dec * math.sin(ra), math.sin(dec))
+
+
+class StarCatalog:
+    """Каталог звёзд с KD-деревом по единичным векторам
+
+    Звёзды переводятся в точки единичной сферы, и ближайшая по углу звезда -
+    это ближайшая точка по хорде. Дерево неявное: звёзды переставлены так,
+    что середина каждого отрезка - узел, а половины - его поддеревья, поэтому
+    поиск обходит O(log n) узлов.
+    """
+
+    def __init__(self, stars):
+        """stars - последовательность (ra_часы, dec_градусы, название)"""
+        self.stars = list(stars)
+        points = [unit_vector(ra, dec) for ra, dec, _ in self.stars]
+        self.order = list(range(len(points)))
+        self.axes = bytearray(len(points))
+        self._build(points)
+        self.points = [points[index] for index in self.order]
+
+    def _build(self, points):
+        """Раскладывает звёзды по медиане оси с наибольшим разбросом, затем половины"""
+        order, axes = self.order, self.axes
+        stack = [(0, len(order))]
+        while stack:
+            low, high = stack.pop()
+            if high - low <= 1:
+                continue
+            part = [points[index] for index in order[low:high]]
+            spreads = [max(point[axis] for point in part) - min(point[axis] for point in part)
+                       for axis in range(3)]
+            axis = spreads.index(max(spreads))
+            order[low:high] = sorted(order[low:high], key=lambda index: points[index][axis])
+            middle = (low + high) // 2
+            axes[middle] = axis
+            stack.append((low, middle))
+            stack.append((middle + 1, high))
+
+    @classmethod
+    def from_csv(cls, path):
+        """Загружает каталог из CSV с заголовком (ra в часах, dec в градусах)"""
+        stars = []
+        with open(path, encoding='utf-8', newline='') as file:
+            reader = csv.DictReader(file)
+            columns = {column.strip().lower(): column for column in reader.fieldnames or ()}
+            if 'ra' not in columns or 'dec' not in columns:
+                raise ValueError(f"{path}: в каталоге нужны столбцы ra и dec")
+
+            for row in reader:
+                try:
+                    ra = float(row[columns['ra']])
+                    dec = float(row[columns['dec']])
+                except (TypeError, ValueError):
+                    continue
+                stars.append((ra, dec, cls._star_name(row, columns, ra, dec)))
+        return cls(stars)
+
+    @staticmethod
+    def _star_name(row, columns, ra, dec):
+        """Название звезды или её обозначение по каталогу"""
+        for column in NAME_COLUMNS:
+            value = (row.get(columns.get(column)) or '').strip()
+            if value:
+                return value
+        for column, template in DESIGNATION_COLUMNS:
+            value = (row.get(columns.get(column)) or '').strip()
+            if value:
+                return template.format(value)
+        return f"RA {ra:.3f}h Dec {dec:+.3f}°"
+
+    def __len__(self):
+        return len(self.stars)
+
+    def nearest(self, ra, dec):
+        """Ближайшая звезда: (ra, dec, название, угловое расстояние в градусах) или None"""
+        if not self.points:
+            return None
+        qx, qy, qz = query = unit_vector(ra, dec)
+        points, axes = self.points, self.axes
+        best, best_distance = -1, float('inf')
+
+        stack = [(0, len(points))]
+        while stack:
+            low, high = stack.pop()
+            if low >= high:
+                continue
+            middle = (low + high) // 2
+            point = points[middle]
+            dx, dy, dz = point[0] - qx, point[1] - qy, point[2] - qz
+            distance = dx * dx + dy * dy + dz * dz
+            if distance < best_distance:
+                best, best_distance = middle, distance
+
+            axis = axes[middle]
+            difference = query[axis] - point[axis]
+            # Дальняя половина нужна, только если плоскость разбиения ближе лучшей звезды
+            if difference < 0:
+                if difference * difference < best_distance:
+                    stack.append((middle + 1, high))
+                stack.append((low, middle))
+            else:
+                if difference * difference < best_distance:
+                    stack.append((low, middle))
+                stack.append((middle + 1, high))
+
+        star_ra, star_dec, name = self.stars[self.order[best]]
+        # Хорда -> угол между направлениями
+        chord = math.sqrt(best_distance)
+        angle = math.degrees(2 * math.asin(min(1.0, chord / 2)))
+        return star_ra, star_dec, name, angle
+
+
 class StarMapGenerator:
-    def __init__(self):
+    # Загруженные каталоги: (путь, время изменения) -> StarCatalog
+    _catalogs = {}
+
+    def __init__(self, catalog_path=DEFAULT_CATALOG):
         # Создаём базовую звёздную карту (созвездия и яркие звёзды)
         self.constellations = {
             'Большая Медведица': {
@@ -40,6 +171,20 @@ class StarMapGenerator:
             (2.530, 89.264, 'Полярная')
         ]
         
+        # Каталог из CSV, если он есть; иначе только яркие звёзды
+        self.catalog = self.load_catalog(catalog_path)
+        
+    def load_catalog(self, catalog_path):
+        """Загружает каталог звёзд (один раз на файл) или строит его из bright_stars"""
+        if catalog_path and os.path.exists(catalog_path):
+            key = (os.path.abspath(catalog_path), os.path.getmtime(catalog_path))
+            catalog = self._catalogs.get(key)
+            if catalog is None:
+                catalog = self._catalogs[key] = StarCatalog.from_csv(catalog_path)
+            if len(catalog):
+                return catalog
+        return StarCatalog(self.bright_stars)
+        
     def word_to_binary(self, word):
         """Переводит слово в двоичный код"""
         binary = ''
@@ -76,18 +221,8 @@ class StarMapGenerator:
         return ra_hours, dec_degrees
     
     def coordinates_to_star_name(self, ra, dec):
-        """Находит ближайшую яркую звезду к данным координатам"""
-        min_distance = float('inf')
-        closest_star = None
-        
-        for star_ra, star_dec, name in self.bright_stars:
-            # Простое евклидово расстояние в 2D
-            distance = math.sqrt((ra - star_ra)**2 + (dec - star_dec)**2)
-            if distance < min_distance:
-                min_distance = distance
-                closest_star = (star_ra, star_dec, name, distance)
-        
-        return closest_star
+        """Находит ближайшую звезду каталога: (ra, dec, название, угловое расстояние в градусах)"""
+        return self.catalog.nearest(ra, dec)
     
     def create_star_from_word(self, word, word_id=1):
         """Создаёт 'звезду' из слова"""
@@ -474,4 +609,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-EOF
@@ -1,71 +1,354 @@
+from functools import lru_cache
+from math import floor, fsum, log, log10, prod
+from types import MappingProxyType
+
+
+# Коды в виде строк: двузначные до 99, дальше как есть
+CODE_STRINGS = tuple(f"{code:02d}" for code in range(256))
+
+# Разделитель слов в пакетном режиме и его код (вне диапазона кодов букв)
+WORD_SEPARATOR = '\uffff'
+SEPARATOR_CODE = 255
+
+# Буквы встроенных алфавитов; код буквы - её номер в алфавите, начиная с 1
+ALPHABET_LETTERS = {
+    "russian": "абвгдеёжзийклмнопрстуфхцчшщъыьэюя",
+    "ukrainian": "абвгґдеєжзиіїйклмнопрстуфхцчшщьюя",
+    "belarusian": "абвгдеёжзійклмнопрстуўфхцчшыьэюя",
+    "latin": "abcdefghijklmnopqrstuvwxyz",
+}
+
+# Однобайтовые кодировки для быстрого пути через bytes.translate
+BYTE_ENCODINGS = ("latin-1", "cp1251")
+
+
+class CodeTable(dict):
+    """Таблица для str.translate: буква -> её код, прочие символы -> 0
+
+    Неизвестные символы запоминаются при первой встрече, так что дальше
+    str.translate находит их без вызова Python-кода.
+    """
+
+    def __missing__(self, key):
+        self[key] = 0
+        return 0
+
+
+def compile_codec(alphabet, separator=False):
+    """Компилирует алфавит {буква: код} в таблицу для str.translate
+
+    separator=True - разделитель слов пакетного режима получает свой код.
+    """
+    table = CodeTable({ord(letter): code for letter, code in alphabet.items()})
+    if separator:
+        table[ord(WORD_SEPARATOR)] = SEPARATOR_CODE
+    return table
+
+
+class Alphabet:
+    """Скомпилированный алфавит: буква -> код без учёта регистра
+
+    Строится один раз и не меняется, поэтому один объект делят все
+    калькуляторы процесса. Если все буквы есть в однобайтовой кодировке
+    (latin-1 или cp1251), текст переводится в коды через encode и
+    bytes.translate по таблице из 256 байт; иначе - через str.translate.
+    """
+    __slots__ = ("name", "letters", "codes", "codec", "batch_codec", "encoding", "byte_table")
+
+    def __init__(self, name, letters):
+        """letters - строка букв (коды по порядку с 1) или словарь {буква: код}"""
+        if isinstance(letters, str):
+            letters = {letter: code for code, letter in enumerate(letters, 1)}
+
+        codes = {}
+        for letter, code in letters.items():
+            if len(letter) != 1:
+                raise ValueError(f"Буква алфавита должна быть одним символом: {letter!r}")
+            if not 1 <= code < SEPARATOR_CODE:
+                raise ValueError(f"Код буквы '{letter}' должен быть от 1 до {SEPARATOR_CODE - 1}")
+            # Обе формы регистра получают один код
+            for variant in (letter.lower(), letter.upper()):
+                if len(variant) == 1:
+                    codes.setdefault(variant, code)
+
+        self.name = name
+        self.letters = "".join(sorted({letter.lower() for letter in letters},
+                                      key=lambda letter: (codes[letter], letter)))
+        self.codes = MappingProxyType(codes)
+        self.codec = compile_codec(codes)
+        self.batch_codec = compile_codec(codes, separator=True)
+
+        self.encoding = self.byte_table = None
+        if "?" not in codes and "\0" not in codes:
+            for encoding in BYTE_ENCODINGS:
+                try:
+                    encoded = {letter.encode(encoding): code for letter, code in codes.items()}
+                except UnicodeEncodeError:
+                    continue
+                table = bytearray(256)
+                for byte, code in encoded.items():
+                    table[byte[0]] = code
+                # Нулевой байт разделяет слова в пакетном режиме
+                table[0] = SEPARATOR_CODE
+                self.encoding = encoding
+                self.byte_table = bytes(table)
+                break
+
+    def encode(self, text):
+        """Байты с кодами букв текста (0 - символ не из алфавита)"""
+        if self.encoding is not None:
+            # Непредставимые символы заменяются на '?', у которого код 0
+            codes = text.encode(self.encoding, 'replace').translate(self.byte_table)
+            if SEPARATOR_CODE not in codes:
+                return codes
+        return text.translate(self.codec).encode('latin-1')
+
+    def encode_many(self, words):
+        """Коды сразу для списка слов: один перевод на весь список"""
+        if self.encoding is not None:
+            joined = '\0'.join(words)
+            if joined.count('\0') == len(words) - 1:
+                codes = joined.encode(self.encoding, 'replace').translate(self.byte_table)
+                return codes.split(bytes([SEPARATOR_CODE]))
+        codes = WORD_SEPARATOR.join(words).translate(self.batch_codec).encode('latin-1')
+        if codes.count(SEPARATOR_CODE) == len(words) - 1:
+            return codes.split(bytes([SEPARATOR_CODE]))
+        return [self.encode(word) for word in words]
+
+    def __reduce__(self):
+        # Встроенный алфавит передаётся в другой процесс по имени
+        if _alphabets.get(self.name) is self and self.name in ALPHABET_LETTERS:
+            return get_alphabet, (self.name,)
+        return Alphabet, (self.name, {letter: self.codes[letter] for letter in self.letters})
+
+    def __repr__(self):
+        return f"Alphabet({self.name!r}, {len(self.letters)} букв)"
+
+
+# Скомпилированные алфавиты процесса: имя -> Alphabet
+_alphabets = {}
+
+
+def register_alphabet(name, letters):
+    """Добавляет алфавит с именем: строка букв или словарь {буква: код}"""
+    _alphabets[name] = alphabet = Alphabet(name, letters)
+    return alphabet
+
+
+def get_alphabet(alphabet="russian"):
+    """Скомпилированный алфавит по имени (компилируется при первом запросе)
+
+    Можно передать и готовый Alphabet, и словарь {буква: код}.
+    """
+    if isinstance(alphabet, Alphabet):
+        return alphabet
+    if not isinstance(alphabet, str):
+        return Alphabet("custom", alphabet)
+    compiled = _alphabets.get(alphabet)
+    if compiled is None:
+        if alphabet not in ALPHABET_LETTERS:
+            raise ValueError(f"Неизвестный алфавит: {alphabet} "
+                             f"(есть: {', '.join(sorted({*ALPHABET_LETTERS, *_alphabets}))})")
+        compiled = register_alphabet(alphabet, ALPHABET_LETTERS[alphabet])
+    return compiled
+
+
+# Режимы произведения кодов
+PRODUCT_MODES = ("exact", "log", "mod", "digits")
+
+# До такой длины произведение считается простым math.prod
+SHORT_PRODUCT = 64
+
+
+def product_tree(numbers):
+    """Произведение чисел попарно, сбалансированным деревом
+
+    Множители на каждом уровне примерно равной длины, поэтому большие
+    числа умножаются быстрым (Карацубы) умножением, а не по одной цифре
+    к огромному накопленному произведению.
+    """
+    numbers = list(numbers)
+    if not numbers:
+        return 1
+    while len(numbers) > 1:
+        paired = [a * b for a, b in zip(numbers[::2], numbers[1::2])]
+        if len(numbers) % 2:
+            paired.append(numbers[-1])
+        numbers = paired
+    return numbers[0]
+
+
+def code_powers(letters):
+    """Пары (код, сколько раз встречается) для байтов кодов"""
+    return [(code, letters.count(code)) for code in set(letters)]
+
+
+def codes_product(codes, mode="exact", modulus=None):
+    """Произведение ненулевых кодов в одном из режимов
+
+    exact  - точное целое: степени одинаковых кодов и дерево умножений;
+    log    - натуральный логарифм произведения (float);
+    mod    - произведение по модулю modulus (удобно взять простое число);
+    digits - только число десятичных цифр точного произведения.
+    Кодов не больше 254 различных, поэтому все режимы, кроме exact,
+    работают за один проход по байтам при любой длине текста.
+    """
+    letters = codes.replace(b'\0', b'')
+    if mode == "exact":
+        if len(letters) <= SHORT_PRODUCT:
+            return prod(letters)
+        # Степени растут в pow быстрее, чем при умножении по одному коду
+        factors = sorted((pow(code, count) for code, count in code_powers(letters)),
+                         key=int.bit_length)
+        return product_tree(factors)
+    elif mode == "log":
+        return fsum(count * log(code) for code, count in code_powers(letters))
+    elif mode == "mod":
+        if not isinstance(modulus, int) or modulus < 2:
+            raise ValueError("Для режима mod нужен целый модуль больше 1")
+        result = 1
+        for code, count in code_powers(letters):
+            result = result * pow(code, count, modulus) % modulus
+        return result
+    elif mode == "digits":
+        powers = code_powers(letters)
+        exponent = fsum(count * log10(code) for code, count in powers)
+        digits = floor(exponent) + 1
+        # Рядом со степенью десяти погрешности float проверяем точно
+        if abs(exponent - round(exponent)) < 1e-9 * max(1.0, exponent):
+            border = round(exponent)
+            exact = product_tree(pow(code, count) for code, count in powers)
+            digits = border + 1 if exact >= 10 ** border else border
+        return digits
+    raise ValueError(f"Неизвестный режим произведения: {mode} (есть: {', '.join(PRODUCT_MODES)})")
+
+
+class WordValue:
+    """Все значения слова, посчитанные за один разбор
+
+    codes - байты с кодами букв; сумма, минимум и максимум считаются сразу,
+    произведение - при первом обращении (на длинном тексте оно огромное).
+    """
+    __slots__ = ("word", "codes", "sum", "average", "min", "max", "_product")
+
+    OPERATIONS = ("sum", "average", "product", "min", "max")
+
+    def __init__(self, word, codes):
+        self.word = word
+        self.codes = codes
+        self._product = None
+        if not codes:
+            # Пустое слово: все значения нулевые
+            self.sum = self.average = self.min = self.max = self._product = 0
+            return
+        letters = codes.replace(b'\0', b'')
+        self.sum = sum(codes)
+        self.average = self.sum / len(codes)
+        self.min = min(letters) if letters else 0
+        self.max = max(codes)
+
+    @property
+    def product(self):
+        if self._product is None:
+            # Нулевые коды (не буквы) пропускаем
+            self._product = codes_product(self.codes)
+        return self._product
+
+    @property
+    def code_strings(self):
+        """Двузначные коды букв"""
+        return [CODE_STRINGS[code] for code in self.codes]
+
+    def get(self, operation="sum"):
+        """Значение по имени операции (неизвестная операция - сумма)"""
+        if operation not in self.OPERATIONS:
+            operation = "sum"
+        return getattr(self, operation)
+
+    def __repr__(self):
+        return (f"WordValue({self.word!r}, сумма={self.sum}, среднее={self.average:.2f}, "
+                f"мин={self.min}, макс={self.max})")
+
 
 class WordCalculator:
-    def __init__(self):
-        # Русский алфавит с двузначными кодами
-        self.alphabet = {
-            'а': 1, 'б': 2, 'в': 3, 'г': 4, 'д': 5, 'е': 6, 'ё': 7, 'ж': 8, 'з': 9, 'и': 10,
-            'й': 11, 'к': 12, 'л': 13, 'м': 14, 'н': 15, 'о': 16, 'п': 17, 'р': 18, 'с': 19, 
-            'т': 20, 'у': 21, 'ф': 22, 'х': 23, 'ц': 24, 'ч': 25, 'ш': 26, 'щ': 27, 'ъ': 28,
-            'ы': 29, 'ь': 30, 'э': 31, 'ю': 32, 'я': 33,
-            # Заглавные буквы
-            'А': 1, 'Б': 2, 'В': 3, 'Г': 4, 'Д': 5, 'Е': 6, 'Ё': 7, 'Ж': 8, 'З': 9, 'И': 10,
-            'Й': 11, 'К': 12, 'Л': 13, 'М': 14, 'Н': 15, 'О': 16, 'П': 17, 'Р': 18, 'С': 19,
-            'Т': 20, 'У': 21, 'Ф': 22, 'Х': 23, 'Ц': 24, 'Ч': 25, 'Ш': 26, 'Щ': 27, 'Ъ': 28,
-            'Ы': 29, 'Ь': 30, 'Э': 31, 'Ю': 32, 'Я': 33
-        }
+    def __init__(self, alphabet="russian", cache_size=4096):
+        # Алфавит компилируется один раз на процесс и общий для всех калькуляторов
+        self.letters = get_alphabet(alphabet)
+        self.alphabet = self.letters.codes
+        self.codec = self.letters.codec
+        # Значения слов кешируются: сравнения и арифметика не разбирают слово заново
+        self.word_value = lru_cache(maxsize=cache_size)(self._word_value)
         
+    def encode_word(self, word):
+        """Переводит слово в байты с кодами букв (0 - символ не из алфавита)"""
+        return self.letters.encode(word)
+    
     def word_to_code(self, word):
         """Переводит слово в двузначные коды"""
-        codes = []
-        for letter in word:
-            if letter in self.alphabet:
-                code = self.alphabet[letter]
-                # Форматируем как двузначное число (01, 02, ...)
-                codes.append(f"{code:02d}")
-            else:
-                # Для символов не из алфавита используем 00
-                codes.append("00")
-        return codes
+        # Для символов не из алфавита используем 00
+        return [CODE_STRINGS[code] for code in self.encode_word(word)]
+    
+    def _word_value(self, word):
+        """Разбирает слово один раз (через word_value результат кешируется)"""
+        return WordValue(word, self.encode_word(word))
+    
+    def word_product(self, word, mode="exact", modulus=None):
+        """Произведение кодов слова в режиме exact, log, mod или digits (см. codes_product)"""
+        value = self.word_value(word)
+        if not value.codes:
+            return 0
+        if mode == "exact":
+            return value.product
+        return codes_product(value.codes, mode, modulus)
     
     def calculate_word_value(self, word, operation="sum"):
         """Вычисляет значение слова по выбранной операции"""
-        codes = []
-        numeric_codes = []
-        
-        for letter in word:
-            if letter in self.alphabet:
-                code = self.alphabet[letter]
-                codes.append(f"{code:02d}")
-                numeric_codes.append(code)
-            else:
-                codes.append("00")
-                numeric_codes.append(0)
-        
-        if not numeric_codes:
-            return 0, []
+        value = self.word_value(word)
+        return value.get(operation), value.code_strings
+    
+    def aggregate(self, codes, operation="sum"):
+        """Выполняет операцию над байтами кодов (байты работают как массив чисел)"""
+        if not codes:
+            return 0
         
-        # Выполняем выбранную операцию
         if operation == "sum":
-            result = sum(numeric_codes)
+            return sum(codes)
         elif operation == "average":
-            result = sum(numeric_codes) / len(numeric_codes)
+            return sum(codes) / len(codes)
         elif operation == "product":
-            result = 1
-            for num in numeric_codes:
-                result *= num if num > 0 else 1
+            # Нулевые коды (не буквы) пропускаем
+            return codes_product(codes)
         elif operation == "min":
-            result = min([num for num in numeric_codes if num > 0]) if any(numeric_codes) else 0
+            letters = codes.replace(b'\0', b'')
+            return min(letters) if letters else 0
         elif operation == "max":
-            result = max(numeric_codes)
-        else:
-            result = sum(numeric_codes)
-        
-        return result, codes
+            return max(codes)
+        return sum(codes)
+    
+    def score_words(self, words, operation="sum", batch_size=65536):
+        """Считает значения для множества слов пакетами
+
+        Каждый пакет склеивается через разделитель и переводится в коды
+        одним вызовом на весь пакет (Alphabet.encode_many), а затем режется на слова;
+        суммы, минимумы и максимумы по байтам считаются на уровне C.
+        """
+        batch = []
+        for word in words:
+            batch.append(word)
+            if len(batch) >= batch_size:
+                yield from self._score_batch(batch, operation)
+                batch = []
+        if batch:
+            yield from self._score_batch(batch, operation)
+    
+    def _score_batch(self, batch, operation):
+        aggregate = self.aggregate
+        return [aggregate(word_codes, operation) for word_codes in self.letters.encode_many(batch)]
     
     def compare_words(self, word1, word2, operation="compare"):
         """Сравнивает два слова или выполняет операцию между ними"""
-        val1, codes1 = self.calculate_word_value(word1, "sum")
-        val2, codes2 = self.calculate_word_value(word2, "sum")
+        val1 = self.word_value(word1).sum
+        val2 = self.word_value(word2).sum
         
         results = {}
         
@@ -109,23 +392,21 @@ class WordCalculator:
     
     def show_alphabet_table(self):
         """Показывает таблицу соответствия букв и кодов"""
-        print("\nТАБЛИЦА КОДОВ:")
+        print(f"\nТАБЛИЦА КОДОВ ({self.letters.name}):")
         print("-"*30)
         print("Буква | Код | Буква | Код")
         print("-"*30)
         
-        # Сортируем русские буквы
-        russian_letters = sorted([(k, v) for k, v in self.alphabet.items() 
-                                 if k in 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'], 
-                                 key=lambda x: x[1])
+        # Буквы алфавита уже упорядочены по кодам
+        letters = [(letter, self.alphabet[letter]) for letter in self.letters.letters]
         
         # Выводим в два столбца
-        for i in range(0, len(russian_letters), 2):
-            letter1, code1 = russian_letters[i]
+        for i in range(0, len(letters), 2):
+            letter1, code1 = letters[i]
             line = f"  {letter1.upper()}/{letter1}  | {code1:02d}"
             
-            if i + 1 < len(russian_letters):
-                letter2, code2 = russian_letters[i + 1]
+            if i + 1 < len(letters):
+                letter2, code2 = letters[i + 1]
                 line += f"   |  {letter2.upper()}/{letter2}  | {code2:02d}"
             
             print(line)
@@ -163,12 +444,11 @@ def main():
                 
             elif choice == "4":
                 word = input("Введите слово: ").strip()
-                min_val, codes = calculator.calculate_word_value(word, "min")
-                max_val, _ = calculator.calculate_word_value(word, "max")
+                value = calculator.word_value(word)
                 print(f"\nСлово: {word}")
-                print(f"Коды: {' '.join(codes)}")
-                print(f"Минимальный код: {min_val}")
-                print(f"Максимальный код: {max_val}")
+                print(f"Коды: {' '.join(value.code_strings)}")
+                print(f"Минимальный код: {value.min}")
+                print(f"Максимальный код: {value.max}")
                 
             elif choice == "5":
                 word1 = input("Введите первое слово: ").strip()
@@ -195,13 +475,12 @@ def main():
                 operations = {"1": "add", "2": "subtract", "3": "multiply", "4": "divide"}
                 operation = operations.get(op_choice, "add")
                 
+                # Значения берутся из кеша, который заполнил compare_words
                 results = calculator.compare_words(word1, word2, operation)
-                val1, _ = calculator.calculate_word_value(word1, "sum")
-                val2, _ = calculator.calculate_word_value(word2, "sum")
                 
                 print(f"\nОперация над словами:")
-                print(f"'{word1}': сумма = {val1}")
-                print(f"'{word2}': сумма = {val2}")
+                print(f"'{word1}': сумма = {calculator.word_value(word1).sum}")
+                print(f"'{word2}': сумма = {calculator.word_value(word2).sum}")
                 
                 for key, value in results.items():
                     print(f"{key}: {value}")
@@ -225,4 +504,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-EOF
@@ -0,0 +1,272 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+from hashlib import blake2b
+
+from binary_calculator import BitString
+
+
+# Формат файла (все числа little-endian):
+#   заголовок | записи | смещения записей (u64) | хеш-таблица (u64) | кодировки (JSON)
+# Запись: u16 номер кодировки, u32 длина слова в байтах UTF-8, u32 длина кода
+# в битах, затем слово и упакованные биты.
+MAGIC = b"BWC1"
+HEADER = struct.Struct("<4sHxxQQQQQQ")
+RECORD = struct.Struct("<HII")
+
+# Запись контейнера: слово, кодировка и двоичный код
+WordRecord = namedtuple("WordRecord", "word encoding bits")
+
+
+def word_hash(word_bytes):
+    """Стабильный между процессами хеш слова (hash() в Python рандомизирован)"""
+    return int.from_bytes(blake2b(word_bytes, digest_size=8).digest(), "little")
+
+
+def table_size(count):
+    """Размер хеш-таблицы: степень двойки, заполненная не больше чем наполовину"""
+    size = 8
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+def as_little_endian(values):
+    """Байты массива u64 в порядке little-endian"""
+    if sys.byteorder != "little":
+        values = array("Q", values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class ContainerWriter:
+    """Пишет контейнер закодированных слов
+
+    Записи пишутся в файл сразу; в памяти держатся только смещения и хеши
+    (по 16 байт на слово), из которых при закрытии строятся индексы.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.file.write(b"\0" * HEADER.size)
+        self.encodings = []
+        self.encoding_ids = {}
+        self.offsets = array("Q")
+        self.hashes = array("Q")
+
+    def add(self, word, encoding="utf-8", bits=None):
+        """Добавляет слово; bits - готовый код (иначе слово кодируется здесь)"""
+        if bits is None:
+            bits = BitString.from_bytes(word.encode(encoding))
+        else:
+            bits = BitString.coerce(bits)
+
+        if encoding not in self.encoding_ids:
+            self.encoding_ids[encoding] = len(self.encodings)
+            self.encodings.append(encoding)
+
+        word_bytes = word.encode("utf-8")
+        self.offsets.append(self.file.tell())
+        self.hashes.append(word_hash(word_bytes))
+        self.file.write(RECORD.pack(self.encoding_ids[encoding], len(word_bytes), len(bits)))
+        self.file.write(word_bytes)
+        self.file.write(bits.to_bytes())
+        return len(self.offsets) - 1
+
+    def close(self):
+        """Дописывает индексы и заголовок"""
+        if self.file.closed:
+            return
+        count = len(self.offsets)
+
+        offsets_start = self.file.tell()
+        self.file.write(as_little_endian(self.offsets))
+
+        # Открытая адресация с линейным пробированием; в ячейке номер записи + 1
+        size = table_size(count)
+        table = array("Q", bytes(8 * size))
+        mask = size - 1
+        for ordinal, value in enumerate(self.hashes):
+            slot = value & mask
+            while table[slot]:
+                slot = (slot + 1) & mask
+            table[slot] = ordinal + 1
+        table_start = self.file.tell()
+        self.file.write(as_little_endian(table))
+
+        encodings_start = self.file.tell()
+        encodings = json.dumps(self.encodings).encode("utf-8")
+        self.file.write(encodings)
+
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, 1, count, offsets_start, table_start, size,
+                                    encodings_start, len(encodings)))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ContainerReader:
+    """Читает контейнер через mmap: доступ по номеру и по слову за O(1)
+
+    Файл не загружается в память целиком - читаются только нужные записи.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Пустой файл нельзя отобразить в память
+            self.file.close()
+            raise ValueError(f"{path}: это не контейнер слов") from None
+
+        try:
+            (magic, version, self.count, offsets_start, table_start, self.table_size,
+             encodings_start, encodings_length) = HEADER.unpack_from(self.data)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != 1:
+            # Файл и отображение не должны остаться открытыми
+            self.data.close()
+            self.file.close()
+            raise ValueError(f"{path}: это не контейнер слов")
+
+        self.encodings = json.loads(self.data[encodings_start:encodings_start + encodings_length])
+        view = memoryview(self.data)
+        self.offsets = view[offsets_start:offsets_start + 8 * self.count].cast("Q")
+        self.table = view[table_start:table_start + 8 * self.table_size].cast("Q")
+        if sys.byteorder != "little":
+            self.offsets = array("Q", self.offsets)
+            self.offsets.byteswap()
+            self.table = array("Q", self.table)
+            self.table.byteswap()
+
+    def __len__(self):
+        return self.count
+
+    def _read(self, ordinal, with_bits=True):
+        """Разбирает запись: (слово в байтах, номер кодировки, код или None)"""
+        offset = self.offsets[ordinal]
+        encoding_id, word_length, bit_length = RECORD.unpack_from(self.data, offset)
+        start = offset + RECORD.size
+        word = self.data[start:start + word_length]
+        bits = None
+        if with_bits:
+            start += word_length
+            bits = BitString(self.data[start:start + (bit_length + 7) // 8], bit_length)
+        return word, encoding_id, bits
+
+    def __getitem__(self, ordinal):
+        if ordinal < 0:
+            ordinal += self.count
+        if not 0 <= ordinal < self.count:
+            raise IndexError("Номер записи вне диапазона")
+        word, encoding_id, bits = self._read(ordinal)
+        return WordRecord(word.decode("utf-8"), self.encodings[encoding_id], bits)
+
+    def __iter__(self):
+        for ordinal in range(self.count):
+            yield self[ordinal]
+
+    def find(self, word, encoding=None):
+        """Номер записи со словом (и кодировкой, если задана) или -1"""
+        word_bytes = word.encode("utf-8")
+        mask = self.table_size - 1
+        slot = word_hash(word_bytes) & mask
+        while True:
+            entry = self.table[slot]
+            if not entry:
+                return -1
+            stored, encoding_id, _ = self._read(entry - 1, with_bits=False)
+            if stored == word_bytes and (encoding is None or self.encodings[encoding_id] == encoding):
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def get(self, word, encoding=None):
+        """Запись по слову или None"""
+        ordinal = self.find(word, encoding)
+        return self[ordinal] if ordinal >= 0 else None
+
+    def __contains__(self, word):
+        return self.find(word) >= 0
+
+    def close(self):
+        """Закрывает отображение файла"""
+        if self.data.closed:
+            return
+        # Представления нужно освободить до закрытия mmap
+        for view in (self.offsets, self.table):
+            if isinstance(view, memoryview):
+                view.release()
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def build_container(words_path, container_path, encodings=("utf-8",), input_encoding="utf-8"):
+    """Строит контейнер из файла со словами (по слову в строке); возвращает число записей"""
+    with open(words_path, encoding=input_encoding) as words, ContainerWriter(container_path) as writer:
+        for line in words:
+            word = line.strip()
+            if not word:
+                continue
+            for encoding in encodings:
+                try:
+                    writer.add(word, encoding)
+                except UnicodeEncodeError:
+                    continue
+        return len(writer.offsets)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Контейнер закодированных слов")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="построить контейнер из списка слов")
+    build.add_argument("words")
+    build.add_argument("container")
+    build.add_argument("--encodings", default="utf-8", help="кодировки через запятую")
+
+    show = commands.add_parser("show", help="показать записи по номерам или словам")
+    show.add_argument("container")
+    show.add_argument("keys", nargs="+", help="номера записей или слова")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        count = build_container(args.words, args.container, args.encodings.split(","))
+        print(f"Записано слов: {count}, размер файла: {os.path.getsize(args.container)} байт")
+        return 0
+
+    with ContainerReader(args.container) as reader:
+        for key in args.keys:
+            if key.lstrip("-").isdigit():
+                try:
+                    record = reader[int(key)]
+                except IndexError:
+                    record = None
+            else:
+                record = reader.get(key)
+            if record is None:
+                print(f"'{key}': нет в контейнере")
+            else:
+                print(f"'{record.word}' [{record.encoding}] ({len(record.bits)} бит): {record.bits}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
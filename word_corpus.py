@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappushpop, nlargest
+from itertools import repeat
+from operator import attrgetter
+
+from word_calculator import ALPHABET_LETTERS, WordCalculator, WordValue
+
+
+# Значения слова, по которым ведутся топы
+AGGREGATES = WordValue.OPERATIONS
+
+# Байты-пробелы: на них режутся куски файла (в UTF-8, cp1251 и koi8-r они
+# не встречаются внутри многобайтовых символов)
+SPACES = b" \t\r\n\v\f"
+SPACE = re.compile(rb"[ \t\r\n\v\f]")
+
+
+def word_pattern(calculator):
+    """Регулярное выражение слова: непрерывная последовательность букв алфавита"""
+    letters = "".join(sorted(calculator.alphabet))
+    return re.compile(f"[{re.escape(letters)}]+")
+
+
+class CorpusStats:
+    """Сливаемая статистика кодов букв по корпусу текстов
+
+    Хранит только ограниченные по размеру данные: число слов, частоты
+    кодов букв, гистограмму сумм слов и топ-N различных слов по каждому
+    значению, поэтому память не растёт с размером корпуса. Статистики
+    частей корпуса объединяются через merge.
+    """
+
+    def __init__(self, top_n=10):
+        self.top_n = top_n
+        self.words = 0
+        self.letters = Counter()
+        self.histogram = Counter()
+        # Для каждого значения: куча (значение, слово) и множество слов в ней
+        self.top = {aggregate: [] for aggregate in AGGREGATES}
+        self.top_words = {aggregate: set() for aggregate in AGGREGATES}
+
+    def update_text(self, text, calculator, pattern=None):
+        """Добавляет слова из куска текста (слова не должны быть разрезаны)"""
+        words = (pattern or word_pattern(calculator)).findall(text)
+        if not words:
+            return
+        # Все слова переводятся в коды одним вызовом
+        word_codes = calculator.letters.encode_many(words)
+        codes = b"".join(word_codes)
+        self.words += len(words)
+        for code in set(calculator.alphabet.values()):
+            self.letters[code] += codes.count(code)
+
+        self.histogram.update(map(sum, word_codes))
+
+        # Топы считаются только по различным словам куска
+        unique = dict(zip(words, word_codes))
+        values = [WordValue(word, word_code) for word, word_code in unique.items()]
+        for aggregate in AGGREGATES:
+            # При равных значениях порядок задаёт само слово, как и в общей куче
+            pairs = zip(map(attrgetter(aggregate), values), unique)
+            self._offer(aggregate, nlargest(self.top_n, pairs))
+
+    def _offer(self, aggregate, candidates):
+        """Предлагает пары (значение, слово) в топ; повторные слова пропускаются"""
+        heap = self.top[aggregate]
+        present = self.top_words[aggregate]
+        for item in candidates:
+            if item[1] in present:
+                continue
+            if len(heap) < self.top_n:
+                heappush(heap, item)
+                present.add(item[1])
+            elif item > heap[0]:
+                present.discard(heappushpop(heap, item)[1])
+                present.add(item[1])
+
+    def merge(self, other):
+        """Объединяет со статистикой другой части корпуса"""
+        self.words += other.words
+        self.letters.update(other.letters)
+        self.histogram.update(other.histogram)
+        for aggregate in AGGREGATES:
+            self._offer(aggregate, other.top[aggregate])
+        return self
+
+    def result(self, calculator):
+        """Сводка в виде словаря (подходит для JSON)"""
+        letters = {}
+        for letter in calculator.letters.letters:
+            letters.setdefault(calculator.alphabet[letter], letter)
+        total = sum(self.letters.values())
+        sums = sum(value * count for value, count in self.histogram.items())
+
+        return {
+            "слов": self.words,
+            "букв": total,
+            "средняя_сумма": sums / self.words if self.words else 0,
+            "частоты_букв": {letters.get(code, str(code)): count
+                             for code, count in sorted(self.letters.items()) if count},
+            "гистограмма_сумм": {str(value): count for value, count in sorted(self.histogram.items())},
+            "топ": {aggregate: [[word, value] for value, word in sorted(self.top[aggregate], reverse=True)]
+                    for aggregate in AGGREGATES},
+        }
+
+
+def align_shard(file, position, size):
+    """Сдвигает границу куска файла за ближайший пробел, чтобы не резать слово"""
+    if position <= 0 or position >= size:
+        return min(max(position, 0), size)
+    file.seek(position)
+    while True:
+        chunk = file.read(1 << 16)
+        if not chunk:
+            return size
+        match = SPACE.search(chunk)
+        if match:
+            return position + match.end()
+        position += len(chunk)
+
+
+def analyze_corpus_range(path, start, end, top_n=10, encoding="utf-8", alphabet="russian",
+                         chunk_size=1 << 22):
+    """Считает CorpusStats для байтов [start, end) файла (задание для пула процессов)"""
+    calculator = WordCalculator(alphabet, cache_size=0)
+    pattern = word_pattern(calculator)
+    stats = CorpusStats(top_n)
+    carry = b""
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            data = carry + chunk
+            # Недочитанное последнее слово переносится в следующий кусок
+            cut = max(data.rfind(space) for space in SPACES) + 1 if remaining > 0 else len(data)
+            carry = data[cut:]
+            stats.update_text(data[:cut].decode(encoding, errors="replace"), calculator, pattern)
+        if carry:
+            stats.update_text(carry.decode(encoding, errors="replace"), calculator, pattern)
+    return stats
+
+
+def analyze_corpus(path, top_n=10, encoding="utf-8", workers=None, shard_size=1 << 26,
+                   alphabet="russian"):
+    """Статистика по большому текстовому файлу в пуле процессов
+
+    Файл режется на куски около shard_size байт по границам слов; каждый
+    процесс считает свою CorpusStats, затем они сливаются через merge.
+    Кодировка должна быть совместима с ASCII (utf-8, cp1251, koi8-r).
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        bounds = sorted({align_shard(file, position, size) for position in range(0, size, shard_size)} | {size})
+    shards = list(zip(bounds, bounds[1:]))
+
+    if len(shards) <= 1 or workers == 1:
+        results = [analyze_corpus_range(path, start, end, top_n, encoding, alphabet)
+                   for start, end in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(analyze_corpus_range, repeat(path), *zip(*shards),
+                                    repeat(top_n), repeat(encoding), repeat(alphabet)))
+
+    stats = CorpusStats(top_n)
+    for shard_stats in results:
+        stats.merge(shard_stats)
+    return stats
+
+
+def analyze_corpus_stream(stream, top_n=10, chunk_size=1 << 20, calculator=None):
+    """Статистика по текстовому потоку (например, stdin) в одном процессе"""
+    calculator = calculator or WordCalculator(cache_size=0)
+    pattern = word_pattern(calculator)
+    tail = re.compile(pattern.pattern + r"\Z")
+    stats = CorpusStats(top_n)
+    carry = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        text = carry + chunk
+        match = tail.search(text)
+        cut = match.start() if match else len(text)
+        carry = text[cut:]
+        stats.update_text(text[:cut], calculator, pattern)
+    stats.update_text(carry, calculator, pattern)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Статистика кодов букв по большому корпусу текстов")
+    parser.add_argument("path", help="текстовый файл или - для stdin")
+    parser.add_argument("--output", "-o", help="записать сводку в JSON-файл (иначе в stdout)")
+    parser.add_argument("--top", type=int, default=10, help="размер топа по каждому значению")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--alphabet", choices=sorted(ALPHABET_LETTERS), default="russian")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов")
+    parser.add_argument("--shard-size", type=int, default=1 << 26, help="размер куска файла в байтах")
+    args = parser.parse_args(argv)
+
+    if args.path == "-":
+        stdin = open(sys.stdin.fileno(), encoding=args.encoding, errors="replace", closefd=False)
+        stats = analyze_corpus_stream(stdin, args.top, calculator=WordCalculator(args.alphabet, cache_size=0))
+    else:
+        stats = analyze_corpus(args.path, args.top, args.encoding, args.workers, args.shard_size,
+                               args.alphabet)
+
+    summary = stats.result(WordCalculator(args.alphabet, cache_size=0))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(summary, file, ensure_ascii=False, separators=(",", ":"))
+        print(f"Слов: {summary['слов']}, букв: {summary['букв']}; сводка в {args.output}")
+    else:
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=1)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
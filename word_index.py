@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+from word_calculator import ALPHABET_LETTERS, Alphabet, WordCalculator, WordValue
+
+
+# Значения слова, по которым строится индекс
+AGGREGATES = WordValue.OPERATIONS
+
+INDEX_VERSION = 1
+
+
+def alphabet_codes(calculator):
+    """Коды строчных букв алфавита калькулятора"""
+    return {letter: calculator.alphabet[letter] for letter in calculator.letters.letters}
+
+
+class WordValueIndex:
+    """Обратный индекс словаря: значение слова -> слова с этим значением
+
+    Для каждой операции (сумма, среднее, произведение, минимум, максимум)
+    хранятся отсортированные значения и параллельный список номеров слов,
+    поэтому точный запрос и запрос по диапазону - это двоичный поиск плюс
+    выдача k найденных слов, O(log n + k). Новые слова вставляются на своё
+    место в каждом списке без перестройки индекса.
+    """
+
+    def __init__(self, calculator=None):
+        self.calculator = calculator or WordCalculator(cache_size=0)
+        self.words = []
+        self.positions = {}
+        self.values = {aggregate: [] for aggregate in AGGREGATES}
+        self.ids = {aggregate: [] for aggregate in AGGREGATES}
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.positions
+
+    def _value(self, word):
+        return WordValue(word, self.calculator.encode_word(word))
+
+    def add(self, word):
+        """Добавляет слово; возвращает False, если оно уже есть в индексе"""
+        if not word or word in self.positions:
+            return False
+        word_id = len(self.words)
+        self.words.append(word)
+        self.positions[word] = word_id
+
+        value = self._value(word)
+        for aggregate in AGGREGATES:
+            number = value.get(aggregate)
+            values = self.values[aggregate]
+            # Равные значения остаются в порядке добавления слов
+            position = bisect_right(values, number)
+            values.insert(position, number)
+            self.ids[aggregate].insert(position, word_id)
+        return True
+
+    def add_many(self, words):
+        """Добавляет много слов; возвращает число новых
+
+        Большую пачку дешевле дописать и пересортировать, чем вставлять
+        слова по одному.
+        """
+        start = len(self.words)
+        for word in words:
+            if word and word not in self.positions:
+                self.positions[word] = len(self.words)
+                self.words.append(word)
+        added = len(self.words) - start
+        if not added:
+            return 0
+
+        new_values = [self._value(word) for word in self.words[start:]]
+        for aggregate in AGGREGATES:
+            # Значения по номерам слов: старые из индекса, новые посчитанные
+            by_id = [None] * len(self.words)
+            for number, word_id in zip(self.values[aggregate], self.ids[aggregate]):
+                by_id[word_id] = number
+            by_id[start:] = map(attrgetter(aggregate), new_values)
+            # Сортировка устойчива: равные значения остаются в порядке номеров
+            order = sorted(range(len(by_id)), key=by_id.__getitem__)
+            self.values[aggregate] = [by_id[word_id] for word_id in order]
+            self.ids[aggregate] = order
+        return added
+
+    def _check(self, aggregate):
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Неизвестная операция: {aggregate} (есть: {', '.join(AGGREGATES)})")
+
+    def find(self, value, aggregate="sum"):
+        """Все слова, у которых значение операции равно value"""
+        return [word for _, word in self.between(value, value, aggregate)]
+
+    def between(self, low, high, aggregate="sum"):
+        """Пары (значение, слово) со значением в диапазоне [low, high] по возрастанию
+
+        Операция проверяется сразу при вызове, а пары выдаются лениво.
+        """
+        self._check(aggregate)
+        return self._between(low, high, aggregate)
+
+    def _between(self, low, high, aggregate):
+        values = self.values[aggregate]
+        ids = self.ids[aggregate]
+        start = bisect_left(values, low)
+        end = bisect_right(values, high, lo=start)
+        for position in range(start, end):
+            yield values[position], self.words[ids[position]]
+
+    def count(self, low, high=None, aggregate="sum"):
+        """Число слов со значением в диапазоне (или равным low) за O(log n)"""
+        self._check(aggregate)
+        values = self.values[aggregate]
+        high = low if high is None else high
+        return max(0, bisect_right(values, high) - bisect_left(values, low))
+
+    def save(self, path):
+        """Сохраняет индекс (через временный файл, чтобы не испортить старый)"""
+        data = {
+            "версия": INDEX_VERSION,
+            "алфавит": {"имя": self.calculator.letters.name, "коды": alphabet_codes(self.calculator)},
+            "слова": self.words,
+            "значения": self.values,
+            "номера": self.ids,
+        }
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path, calculator=None):
+        """Загружает сохранённый индекс"""
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("версия") != INDEX_VERSION:
+            raise ValueError(f"{path}: неподдерживаемая версия индекса")
+
+        # Значения в индексе верны только для того алфавита, по которому он построен
+        stored = data.get("алфавит", {"имя": "russian", "коды": None})
+        if calculator is None:
+            alphabet = stored["имя"]
+            if stored["коды"] and (alphabet not in ALPHABET_LETTERS or
+                                   alphabet_codes(WordCalculator(alphabet, cache_size=0)) != stored["коды"]):
+                alphabet = Alphabet(alphabet, stored["коды"])
+            calculator = WordCalculator(alphabet, cache_size=0)
+        elif stored["коды"] and alphabet_codes(calculator) != stored["коды"]:
+            raise ValueError(f"{path}: индекс построен для другого алфавита ({stored['имя']})")
+
+        index = cls(calculator)
+        index.words = data["слова"]
+        index.positions = {word: word_id for word_id, word in enumerate(index.words)}
+        index.values = data["значения"]
+        index.ids = data["номера"]
+        return index
+
+    @classmethod
+    def build(cls, words_path, calculator=None, encoding="utf-8"):
+        """Строит индекс из файла со словами (по слову в строке)"""
+        index = cls(calculator)
+        with open(words_path, encoding=encoding) as words:
+            index.add_many(line.strip() for line in words)
+        return index
+
+
+def parse_number(text):
+    """Число из командной строки: целое или дробное"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Индекс словаря по значениям слов")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="построить индекс из списка слов")
+    build.add_argument("words")
+    build.add_argument("index")
+    build.add_argument("--alphabet", choices=sorted(ALPHABET_LETTERS), default="russian")
+
+    add = commands.add_parser("add", help="добавить слова в готовый индекс")
+    add.add_argument("index")
+    add.add_argument("words", nargs="+", help="слова или файл со словами (@файл)")
+
+    find = commands.add_parser("find", help="слова со значением или в диапазоне значений")
+    find.add_argument("index")
+    find.add_argument("low", type=parse_number)
+    find.add_argument("high", type=parse_number, nargs="?")
+    find.add_argument("--aggregate", choices=AGGREGATES, default="sum")
+    find.add_argument("--limit", type=int, default=0, help="не больше N слов (0 - все)")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        index = WordValueIndex.build(args.words, WordCalculator(args.alphabet, cache_size=0))
+        index.save(args.index)
+        print(f"Слов в индексе: {len(index)}")
+        return 0
+
+    index = WordValueIndex.load(args.index)
+    if args.command == "add":
+        added = 0
+        for item in args.words:
+            if item.startswith("@"):
+                with open(item[1:], encoding="utf-8") as words:
+                    added += index.add_many(line.strip() for line in words)
+            else:
+                added += index.add(item)
+        index.save(args.index)
+        print(f"Добавлено слов: {added}, всего: {len(index)}")
+        return 0
+
+    high = args.low if args.high is None else args.high
+    shown = 0
+    for value, word in index.between(args.low, high, args.aggregate):
+        if args.limit and shown >= args.limit:
+            break
+        print(f"{value}\t{word}")
+        shown += 1
+    print(f"Найдено слов: {index.count(args.low, high, args.aggregate)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
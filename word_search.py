@@ -0,0 +1,225 @@
+import argparse
+import gc
+import sys
+from itertools import islice
+
+from word_calculator import ALPHABET_LETTERS, WordCalculator
+
+
+class TrieNode:
+    """Узел префиксного дерева словаря
+
+    min_sum/max_sum и min_length/max_length - границы суммы кодов и числа
+    букв у всех продолжений слова от этого узла; по ним отсекаются ветви,
+    в которых нужной суммы уже не набрать.
+    """
+    __slots__ = ("children", "word", "min_sum", "max_sum", "min_length", "max_length")
+
+    def __init__(self, rest_sum=0, rest_length=0):
+        self.children = {}
+        self.word = None
+        self.min_sum = self.max_sum = rest_sum
+        self.min_length = self.max_length = rest_length
+
+    def update(self, rest_sum, rest_length):
+        if rest_sum < self.min_sum:
+            self.min_sum = rest_sum
+        if rest_sum > self.max_sum:
+            self.max_sum = rest_sum
+        if rest_length < self.min_length:
+            self.min_length = rest_length
+        if rest_length > self.max_length:
+            self.max_length = rest_length
+
+
+def letter_filter(letters):
+    """Множество допустимых символов в обоих регистрах (None - любые)"""
+    if letters is None:
+        return None
+    return set(letters.lower()) | set(letters.upper())
+
+
+class LexiconTrie:
+    """Словарь в виде префиксного дерева для поиска слов с заданной суммой кодов"""
+
+    def __init__(self, calculator=None):
+        self.calculator = calculator or WordCalculator(cache_size=0)
+        self.root = None
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, word):
+        """Добавляет слово; возвращает False, если оно уже есть"""
+        if not word:
+            return False
+        codes = self.calculator.encode_word(word)
+        rest_sum, rest_length = sum(codes), len(word)
+
+        # Границы продолжений обновляются вдоль всего пути слова
+        # (у повторного слова они те же, так что обновлять можно сразу)
+        if self.root is None:
+            self.root = TrieNode(rest_sum, rest_length)
+        node = self.root
+        node.update(rest_sum, rest_length)
+        for letter, code in zip(word, codes):
+            rest_sum -= code
+            rest_length -= 1
+            child = node.children.get(letter)
+            if child is None:
+                child = node.children[letter] = TrieNode(rest_sum, rest_length)
+            else:
+                child.update(rest_sum, rest_length)
+            node = child
+
+        if node.word is not None:
+            return False
+        node.word = word
+        self.count += 1
+        return True
+
+    def add_many(self, words):
+        """Добавляет слова; возвращает число новых
+
+        Сборщик мусора на время загрузки отключается: дерево из миллионов
+        узлов иначе многократно обходится им целиком.
+        """
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return sum(self.add(word) for word in words)
+        finally:
+            if enabled:
+                gc.enable()
+
+    @classmethod
+    def from_file(cls, path, calculator=None, encoding="utf-8"):
+        """Строит дерево из файла со словами (по слову в строке)"""
+        trie = cls(calculator)
+        with open(path, encoding=encoding) as words:
+            trie.add_many(line.strip() for line in words)
+        return trie
+
+    def search(self, target, min_length=1, max_length=None, prefix="", suffix="", letters=None):
+        """Слова словаря с суммой кодов target; выдаются по одному по мере нахождения
+
+        Ветвь отбрасывается, если target вне границ суммы её продолжений
+        или их длины не попадают в [min_length, max_length].
+        """
+        max_length = float("inf") if max_length is None else max_length
+        allowed = letter_filter(letters)
+        codes = self.calculator.codec
+
+        # Спуск по префиксу
+        node = self.root
+        if node is None:
+            return
+        for letter in prefix:
+            if allowed is not None and letter not in allowed:
+                return
+            node = node.children.get(letter)
+            if node is None:
+                return
+        rest = target - sum(self.calculator.encode_word(prefix))
+
+        stack = [(node, rest, len(prefix))]
+        while stack:
+            node, rest, depth = stack.pop()
+            if not node.min_sum <= rest <= node.max_sum:
+                continue
+            if depth + node.min_length > max_length or depth + node.max_length < min_length:
+                continue
+
+            if rest == 0 and node.word is not None and depth >= min_length and node.word.endswith(suffix):
+                yield node.word
+            for letter, child in node.children.items():
+                if allowed is None or letter in allowed:
+                    stack.append((child, rest - codes[ord(letter)], depth + 1))
+
+
+def generate_words(target, min_length=1, max_length=8, prefix="", suffix="", letters=None,
+                   calculator=None):
+    """Все строки из букв алфавита с суммой кодов target (не только словарные слова)
+
+    Заранее для каждой длины L считается битовая маска сумм, достижимых
+    ровно L допустимыми буквами. Ветвь продолжается, только если остаток
+    суммы достижим оставшимся числом букв, поэтому перебор не заходит в
+    тупики и время пропорционально числу найденных строк.
+    """
+    calculator = calculator or WordCalculator(cache_size=0)
+    if letters is None:
+        letters = calculator.letters.letters
+    alphabet = sorted({(calculator.codec[ord(letter)], letter) for letter in letters.lower()
+                       if calculator.codec[ord(letter)] > 0})
+
+    fixed = len(prefix) + len(suffix)
+    rest = target - sum(calculator.encode_word(prefix + suffix))
+    low = max(min_length - fixed, 0)
+    high = max_length - fixed
+    if high < 0 or rest < 0 or not alphabet:
+        return
+
+    # reachable[L]: бит s установлен, если сумму s можно набрать ровно L буквами
+    reachable = [1]
+    for _ in range(high):
+        previous = reachable[-1]
+        mask = 0
+        for code, _ in alphabet:
+            mask |= previous << code
+        reachable.append(mask)
+
+    # feasible[d]: суммы, которые можно добрать после d букв середины слова
+    feasible = []
+    for depth in range(high + 1):
+        mask = 0
+        for length in range(max(low - depth, 0), high - depth + 1):
+            mask |= reachable[length]
+        feasible.append(mask)
+
+    if not feasible[0] >> rest & 1:
+        return
+    stack = [("", rest)]
+    while stack:
+        middle, rest = stack.pop()
+        if rest == 0:
+            yield prefix + middle + suffix
+            continue
+        depth = len(middle) + 1
+        # Обратный порядок, чтобы строки выдавались по алфавиту кодов
+        for code, letter in reversed(alphabet):
+            if code <= rest and feasible[depth] >> (rest - code) & 1:
+                stack.append((middle + letter, rest - code))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Поиск слов с заданной суммой кодов букв")
+    parser.add_argument("target", type=int, help="нужная сумма кодов")
+    parser.add_argument("--words", metavar="FILE",
+                        help="искать в словаре (без него строки составляются из букв алфавита)")
+    parser.add_argument("--min-length", type=int, default=1)
+    parser.add_argument("--max-length", type=int, default=None,
+                        help="по умолчанию без ограничения в словаре и 8 букв при переборе")
+    parser.add_argument("--prefix", default="")
+    parser.add_argument("--suffix", default="")
+    parser.add_argument("--letters", help="допустимые буквы, например абвгд")
+    parser.add_argument("--alphabet", choices=sorted(ALPHABET_LETTERS), default="russian")
+    parser.add_argument("--limit", type=int, default=100, help="не больше N слов (0 - все)")
+    args = parser.parse_args(argv)
+
+    calculator = WordCalculator(args.alphabet, cache_size=0)
+    if args.words:
+        found = LexiconTrie.from_file(args.words, calculator).search(
+            args.target, args.min_length, args.max_length, args.prefix, args.suffix, args.letters)
+    else:
+        max_length = 8 if args.max_length is None else args.max_length
+        found = generate_words(args.target, args.min_length, max_length,
+                               args.prefix, args.suffix, args.letters, calculator)
+
+    for word in islice(found, args.limit or None):
+        print(word)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
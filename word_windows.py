@@ -0,0 +1,212 @@
+import argparse
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, islice
+from operator import sub
+
+from word_calculator import ALPHABET_LETTERS, WordCalculator
+
+
+# Непрерывная последовательность кодов букв (0 - символ не из алфавита)
+LETTER_RUN = re.compile(rb"[^\x00]+")
+
+
+class TextWindows:
+    """Суммы кодов букв по окнам длинного текста за O(1) на запрос
+
+    Коды букв текста (без прочих символов) переводятся в массив префиксных
+    сумм один раз; сумма и среднее любого окна из k букв - разность двух
+    его элементов. Минимум и максимум на отрезке берутся из разреженных
+    таблиц, которые строятся при первом таком запросе. Так же по словам:
+    префиксные суммы сумм слов дают значение любой n-граммы слов.
+    """
+
+    def __init__(self, text, calculator=None):
+        self.text = text
+        self.calculator = calculator or WordCalculator(cache_size=0)
+
+        codes = self.calculator.encode_word(text)
+        # Слова - непрерывные последовательности букв; код символа стоит на месте символа
+        self.word_spans = [match.span() for match in LETTER_RUN.finditer(codes)]
+        self.letters = codes.replace(b"\0", b"")
+        self.prefix = array("Q", accumulate(self.letters, initial=0))
+        # Номер первой буквы каждого слова среди всех букв текста
+        self.word_starts = array("Q", accumulate((end - start for start, end in self.word_spans), initial=0))
+        self.word_prefix = array("Q", (self.prefix[start] for start in self.word_starts))
+
+        self._min_table = self._max_table = None
+
+    def __len__(self):
+        """Число букв в тексте"""
+        return len(self.letters)
+
+    def _check(self, start, end, size):
+        if not 0 <= start < end <= size:
+            raise IndexError(f"Окно [{start}, {end}) вне диапазона 0..{size}")
+
+    def window_sum(self, start, length):
+        """Сумма кодов букв [start, start + length)"""
+        self._check(start, start + length, len(self.letters))
+        return self.prefix[start + length] - self.prefix[start]
+
+    def window_average(self, start, length):
+        """Среднее кодов букв [start, start + length)"""
+        return self.window_sum(start, length) / length
+
+    def window_sums(self, length):
+        """Суммы всех окон из length букв по порядку"""
+        if length <= 0:
+            raise ValueError("Длина окна должна быть положительной")
+        return map(sub, self.prefix[length:], self.prefix)
+
+    @staticmethod
+    def _sparse_table(values, largest):
+        """Уровни разреженной таблицы: level[k][i] - минимум (или максимум) values[i:i + 2**k]
+
+        Уровень считается сразу для всех позиций на целых числах: каждый код
+        занимает 16-битную ячейку, и поячеечное сравнение двух уровней - это
+        несколько операций над длинными целыми без цикла по буквам.
+        """
+        size = len(values)
+        wide = bytearray(2 * size)
+        wide[::2] = values
+        ones = int.from_bytes(b"\x01\x00" * size, "little")
+        guard = ones << 15
+
+        levels = [values]
+        current = int.from_bytes(wide, "little")
+        step = 1
+        while 2 * step <= size:
+            # Ячейка i сдвинутого числа - значение позиции i + step
+            shifted = current >> (16 * step)
+            # Бит 15 ячейки остаётся, только если current >= shifted в этой ячейке
+            not_less = (((current | guard) - shifted) >> 15) & ones
+            mask = (not_less << 16) - not_less
+            if largest:
+                current = (current & mask) | (shifted & ~mask)
+            else:
+                current = (shifted & mask) | (current & ~mask)
+            levels.append(current.to_bytes(2 * size, "little")[::2])
+            step *= 2
+        return levels
+
+    def _range(self, table, pick, start, length):
+        self._check(start, start + length, len(self.letters))
+        level = length.bit_length() - 1
+        row = table[level]
+        return pick(row[start], row[start + length - (1 << level)])
+
+    def window_min(self, start, length):
+        """Минимальный код букв [start, start + length) за O(1)"""
+        if self._min_table is None:
+            self._min_table = self._sparse_table(self.letters, largest=False)
+        return self._range(self._min_table, min, start, length)
+
+    def window_max(self, start, length):
+        """Максимальный код букв [start, start + length) за O(1)"""
+        if self._max_table is None:
+            self._max_table = self._sparse_table(self.letters, largest=True)
+        return self._range(self._max_table, max, start, length)
+
+    def find_windows(self, target, length=None):
+        """Окна (начало, конец) в буквах с суммой кодов target за линейное время
+
+        С length - только окна этой длины; без него - окна любой длины.
+        Коды букв положительны, поэтому префиксные суммы строго растут и
+        для каждого конца окна подходящее начало ищется двумя указателями.
+        """
+        if length is not None:
+            for start, total in enumerate(self.window_sums(length)):
+                if total == target:
+                    yield start, start + length
+            return
+        yield from self._find_runs(self.prefix, target)
+
+    @staticmethod
+    def _find_runs(prefix, target):
+        """Пары (i, j), i < j, с prefix[j] - prefix[i] == target для растущего prefix"""
+        if target <= 0:
+            return
+        start = 0
+        for end in range(1, len(prefix)):
+            needed = prefix[end] - target
+            while prefix[start] < needed:
+                start += 1
+            if prefix[start] == needed and start < end:
+                yield start, end
+
+    def passage(self, start, end):
+        """Фрагмент текста от буквы start до буквы end - 1 включительно"""
+        self._check(start, end, len(self.letters))
+        return self.text[self._text_position(start):self._text_position(end - 1) + 1]
+
+    def _text_position(self, letter):
+        """Позиция буквы с номером letter в исходном тексте"""
+        word = bisect_right(self.word_starts, letter) - 1
+        return self.word_spans[word][0] + letter - self.word_starts[word]
+
+    def words(self, start=0, end=None):
+        """Слова текста с номерами [start, end)"""
+        return [self.text[first:last] for first, last in self.word_spans[start:end]]
+
+    def ngram_sum(self, start, count):
+        """Сумма кодов слов [start, start + count)"""
+        self._check(start, start + count, len(self.word_spans))
+        return self.word_prefix[start + count] - self.word_prefix[start]
+
+    def ngram_sums(self, count):
+        """Суммы всех n-грамм из count слов по порядку"""
+        if count <= 0:
+            raise ValueError("Число слов должно быть положительным")
+        return map(sub, self.word_prefix[count:], self.word_prefix)
+
+    def find_ngrams(self, target, count=None):
+        """n-граммы слов (первое слово, последнее + 1) с суммой кодов target"""
+        if count is not None:
+            for start, total in enumerate(self.ngram_sums(count)):
+                if total == target:
+                    yield start, start + count
+            return
+        yield from self._find_runs(self.word_prefix, target)
+
+    def ngram_text(self, start, end):
+        """Фрагмент текста от слова start до слова end - 1 включительно"""
+        self._check(start, end, len(self.word_spans))
+        return self.text[self.word_spans[start][0]:self.word_spans[end - 1][1]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Фрагменты текста с заданной суммой кодов букв")
+    parser.add_argument("path", help="текстовый файл или - для stdin")
+    parser.add_argument("target", type=int, help="нужная сумма кодов")
+    parser.add_argument("--letters", type=int, help="только окна из стольких букв")
+    parser.add_argument("--words", action="store_true", help="искать по целым словам (n-граммы)")
+    parser.add_argument("--ngram", type=int, help="только n-граммы из стольких слов")
+    parser.add_argument("--alphabet", choices=sorted(ALPHABET_LETTERS), default="russian")
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--limit", type=int, default=20, help="не больше N фрагментов (0 - все)")
+    args = parser.parse_args(argv)
+
+    if args.path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(args.path, encoding=args.encoding) as file:
+            text = file.read()
+    windows = TextWindows(text, WordCalculator(args.alphabet, cache_size=0))
+
+    if args.words or args.ngram:
+        found = windows.find_ngrams(args.target, args.ngram)
+        show = windows.ngram_text
+    else:
+        found = windows.find_windows(args.target, args.letters)
+        show = windows.passage
+
+    for start, end in islice(found, args.limit or None):
+        print(f"{start}-{end}\t{show(start, end)!r}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())